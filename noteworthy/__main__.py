@@ -6,7 +6,7 @@ import shutil
 import os
 from pathlib import Path
 from .config import BUILD_DIR
-from .tui.app import run_app
+from .tui.app import run_session
 
 def main():
     parser = argparse.ArgumentParser(description='Build Noteworthy documentation', add_help=False)
@@ -14,7 +14,7 @@ def main():
     logging.basicConfig(level=logging.CRITICAL)
     os.environ.setdefault('ESCDELAY', '25')
     try:
-        curses.wrapper(lambda scr: run_app(scr, args))
+        curses.wrapper(lambda scr: run_session(scr, args))
     except KeyboardInterrupt:
         print('\nBuild cancelled.')
         if BUILD_DIR.exists():
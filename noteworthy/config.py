@@ -14,6 +14,7 @@ SCHEMES_FILE = BASE_DIR / 'templates/config/schemes.json'
 SETUP_FILE = BASE_DIR / 'templates/setup.typ'
 
 LOGO = ['         ,--. ', "       ,--.'| ", '   ,--,:  : | ', ",`--.'`|  ' : ", '|   :  :  | | ', ':   |   \\ | : ', "|   : '  '; | ", "'   ' ;.    ; ", '|   | | \\   | ', "'   : |  ; .' ", "|   | '`--'   ", "'   : |       ", ";   |.'       ", "'---'         "]
+LOGO_H, LOGO_W = (len(LOGO), max(map(len, LOGO)))
 HAPPY_FACE = ['    __  ', ' _  \\ \\ ', '(_)  | |', '     | |', ' _   | |', '(_)  | |', '    /_/ ']
 HMM_FACE = ['     _ ', ' _  | |', '(_) | |', '    | |', ' _  | |', '(_) | |', '    |_|']
 SAD_FACE = ['       __', '  _   / /', ' (_) | | ', '     | | ', '  _  | | ', ' (_) | | ', '      \\_\\']
\ No newline at end of file
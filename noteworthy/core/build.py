@@ -1,14 +1,50 @@
 import shutil
 import subprocess
 import os
-import fcntl
-import time
+import hashlib
+import queue
+import threading
 import json
 import logging
+import mmap
+import re
 from pathlib import Path
 from ..config import BASE_DIR, BUILD_DIR, RENDERER_FILE, PREFACE_FILE
 
+STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+ROOT_REF_RE = re.compile(rb'/Root\s+(\d+)\s+(\d+)\s+R')
+PAGES_REF_RE = re.compile(rb'/Pages\s+(\d+)\s+(\d+)\s+R')
+COUNT_RE = re.compile(rb'/Count\s+(\d+)')
+
+def _pdf_object(data, ref):
+    tag, pos = (b'%s %s obj' % ref, len(data))
+    while True:
+        pos = data.rfind(tag, 0, pos)
+        if pos <= 0 or not data[pos - 1:pos].isdigit():
+            break
+    end = data.find(b'endobj', pos) if pos > 0 else -1
+    return data[pos:end] if end > 0 else None
+
+def read_pdf_page_count(pdf_path):
+    try:
+        with open(pdf_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            xref = None
+            for xref in STARTXREF_RE.finditer(data, max(0, len(data) - 1024)):
+                pass
+            start = int(xref.group(1)) if xref else data.rfind(b'trailer')
+            root = ROOT_REF_RE.search(data, start) if 0 <= start < len(data) else None
+            catalog = root and _pdf_object(data, root.groups())
+            pages = catalog and PAGES_REF_RE.search(catalog)
+            tree = pages and _pdf_object(data, pages.groups())
+            count = tree and COUNT_RE.search(tree)
+        return int(count.group(1)) if count else 0
+    except (OSError, ValueError):
+        return 0
+
 def get_pdf_page_count(pdf_path):
+    count = read_pdf_page_count(pdf_path)
+    if count:
+        return count
     try:
         result = subprocess.run(['pdfinfo', str(pdf_path)], capture_output=True, text=True, check=True)
         for line in result.stdout.split('\n'):
@@ -23,6 +59,20 @@ class TypstBuildError(Exception):
         super().__init__(f"{message}\n\n[Typst Output]:\n{stderr}")
         self.stderr = stderr
 
+_page_map_digests = {}
+
+def write_page_map(pm_file, page_map):
+    payload = json.dumps(page_map).encode()
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    if _page_map_digests.get(pm_file) == digest and pm_file.exists():
+        return False
+    tmp = pm_file.with_suffix('.json.tmp')
+    tmp.write_bytes(payload)
+    os.replace(tmp, pm_file)
+    _page_map_digests[pm_file] = digest
+    logging.info(f'Wrote page_map to {pm_file} ({len(payload)} bytes)')
+    return True
+
 def compile_target(target, output, page_offset=None, page_map=None, extra_flags=None, callback=None, log_callback=None):
     cmd = ['typst', 'compile', str(RENDERER_FILE), str(output), '--root', str(BASE_DIR), '--input', f'target={target}']
     if page_offset:
@@ -30,8 +80,7 @@ def compile_target(target, output, page_offset=None, page_map=None, extra_flags=
     if page_map:
         pm_file = BUILD_DIR / 'page_map.json'
         try:
-            pm_file.write_text(json.dumps(page_map))
-            logging.info(f'Wrote page_map to {pm_file} ({len(json.dumps(page_map))} bytes)')
+            write_page_map(pm_file, page_map)
             rel_path = pm_file.relative_to(BASE_DIR)
             cmd.extend(['--input', f'page-map-file=/{rel_path}'])
         except Exception as e:
@@ -48,42 +97,28 @@ def compile_target(target, output, page_offset=None, page_map=None, extra_flags=
         logging.error(f'Popen failed for {target}: {e}')
         raise e
     all_output = []
-    fd = proc.stderr.fileno()
-    fl = fcntl.fcntl(fd, fcntl.F_GETFL)
-    fcntl.fcntl(fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
-    fd_out = proc.stdout.fileno()
-    fl_out = fcntl.fcntl(fd_out, fcntl.F_GETFL)
-    fcntl.fcntl(fd_out, fcntl.F_SETFL, fl_out | os.O_NONBLOCK)
-    while proc.poll() is None:
+    q = queue.Queue()
+
+    def pump(stream):
+        for line in iter(stream.readline, ''):
+            q.put(line)
+        stream.close()
+
+    pumps = [threading.Thread(target=pump, args=(stream,), daemon=True) for stream in (proc.stderr, proc.stdout)]
+    for t in pumps:
+        t.start()
+    while proc.poll() is None or any(t.is_alive() for t in pumps) or not q.empty():
         if callback and callback() is False:
             proc.terminate()
             raise Exception('Build cancelled')
         try:
-            chunk = proc.stderr.read(4096)
-            if chunk:
-                all_output.append(chunk)
-                if log_callback:
-                    log_callback(chunk)
-        except:
-            pass
-        try:
-            chunk = proc.stdout.read(4096)
-            if chunk:
-                all_output.append(chunk)
-                if log_callback:
-                    log_callback(chunk)
-        except:
-            pass
-        time.sleep(0.05)
-    stdout, stderr = proc.communicate()
-    if stderr:
-        all_output.append(stderr)
-        if log_callback:
-            log_callback(stderr)
-    if stdout:
-        all_output.append(stdout)
+            line = q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        all_output.append(line)
         if log_callback:
-            log_callback(stdout)
+            log_callback(line)
+    proc.wait()
     if proc.returncode != 0:
         logging.error(f'Typst compilation failed for {target}. Return code: {proc.returncode}')
         logging.error(f"Output: {''.join(all_output)}")
@@ -92,6 +127,8 @@ def compile_target(target, output, page_offset=None, page_map=None, extra_flags=
         log_callback(f'[done] {target}\n')
     return ''.join(all_output)
 
+MERGE_BATCH_SIZE = 100
+
 def merge_pdfs(pdf_files, output):
     files = [str(p) for p in pdf_files if p.exists()]
     logging.info(f"Merging {len(files)} files. First: {(files[0] if files else 'None')}")
@@ -99,93 +136,40 @@ def merge_pdfs(pdf_files, output):
         return False
     if shutil.which('pdfunite'):
         logging.info('Using pdfunite')
+        intermediates = []
         try:
-            subprocess.run(['pdfunite'] + files + [str(output)], check=True, capture_output=True)
+            level = 0
+            while len(files) > MERGE_BATCH_SIZE:
+                batches = []
+                for bi in range(0, len(files), MERGE_BATCH_SIZE):
+                    part = BUILD_DIR / f'merge_{level}_{bi // MERGE_BATCH_SIZE}.pdf'
+                    subprocess.run(['pdfunite'] + files[bi:bi + MERGE_BATCH_SIZE] + [str(part)], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                    batches.append(str(part))
+                intermediates.extend(batches)
+                files = batches
+                level += 1
+            subprocess.run(['pdfunite'] + files + [str(output)], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             return 'pdfunite'
         except Exception as e:
             logging.error(f'pdfunite failed: {e}')
+        finally:
+            for part in intermediates:
+                Path(part).unlink(missing_ok=True)
     elif shutil.which('gs'):
         logging.info('Using ghostscript')
         try:
-            subprocess.run(['gs', '-dBATCH', '-dNOPAUSE', '-q', '-sDEVICE=pdfwrite', f'-sOutputFile={output}'] + files, check=True, capture_output=True)
+            subprocess.run(['gs', '-dBATCH', '-dNOPAUSE', '-q', '-sDEVICE=pdfwrite', f'-sOutputFile={output}'] + files, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             return 'ghostscript'
         except Exception as e:
             logging.error(f'ghostscript failed: {e}')
     return None
 
-def create_pdf_metadata(chapters, page_map, output_file):
-    bookmarks = []
-    
-    try:
-        import pypdf
-    except ImportError:
-        logging.warning("pypdf not found, skipping deep bookmark extraction")
-        pypdf = None
-
-    def extract_bookmarks(pdf_path, base_level, start_page):
-        if not pypdf or not pdf_path.exists():
-            return []
-        
-        extracted = []
-        try:
-            reader = pypdf.PdfReader(pdf_path)
-            
-            def process_outline(outline_items, current_level):
-                res = []
-                for item in outline_items:
-                    if isinstance(item, list):
-                        res.extend(process_outline(item, current_level + 1))
-                    elif hasattr(item, 'title'):
-                        try:
-                            pg = reader.get_page_number(item.page)
-                            res.append({
-                                'title': item.title,
-                                'level': current_level,
-                                'page': start_page + pg
-                            })
-                        except:
-                            pass
-                return res
-                
-            extracted = process_outline(reader.outline, base_level + 1)
-            
-        except Exception as e:
-            logging.error(f"Failed to extract bookmarks from {pdf_path}: {e}")
-            
-        return extracted
-
-    for key, title in [('cover', 'Cover'), ('preface', 'Preface'), ('outline', 'Table of Contents')]:
-        if key in page_map:
-            bookmarks.extend([f'BookmarkBegin', f'BookmarkTitle: {title}', f'BookmarkLevel: 1', f'BookmarkPageNumber: {page_map[key]}'])
-
-    for ci, ch in chapters:
-        ch_id = str(ch.get('number', ci + 1))
-        ch_key = f'chapter-{ci + 1}'
-        
-        if ch_key in page_map:
-            start_pg = page_map[ch_key]
-            bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {ch['title']}", f'BookmarkLevel: 1', f"BookmarkPageNumber: {start_pg}"])
-            
-            pdf_path = BUILD_DIR / f'10_chapter_{ci}_cover.pdf'
-            
-            sub_marks = extract_bookmarks(pdf_path, 1, start_pg)
-            for sm in sub_marks:
-                bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {sm['title']}", f'BookmarkLevel: {sm["level"]}', f"BookmarkPageNumber: {sm['page']}"])
-
-        for ai, p in enumerate(ch['pages']):
-            key = f'{ci}/{ai}'
-            if key in page_map:
-                start_pg = page_map[key]
-                bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {p['title']}", f'BookmarkLevel: 2', f"BookmarkPageNumber: {start_pg}"])
-                
-                pdf_path = BUILD_DIR / f'20_page_{ci}_{ai}.pdf'
-                
-                sub_marks = extract_bookmarks(pdf_path, 2, start_pg)
-                for sm in sub_marks:
-                    bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {sm['title']}", f'BookmarkLevel: {sm["level"]}', f"BookmarkPageNumber: {sm['page']}"])
-                        
 import concurrent.futures
 
+def compile_and_count(target, output, **kwargs):
+    compile_target(target, output, **kwargs)
+    return get_pdf_page_count(output)
+
 class BuildManager:
     def __init__(self, build_dir):
         self.build_dir = build_dir
@@ -193,7 +177,6 @@ class BuildManager:
         self.page_counts = self.load_cache()
         self.page_map = {}
         self.current_offset = 1
-        import threading
         self.lock = threading.Lock()
         
     def load_cache(self):
@@ -291,7 +274,7 @@ class BuildManager:
                     offset = projected_offsets[key]
                     
                     f = executor.submit(
-                        compile_target, 
+                        compile_and_count, 
                         t_data[2],
                         t_data[3],
                         page_offset=offset,
@@ -304,11 +287,7 @@ class BuildManager:
                 for future in concurrent.futures.as_completed(future_to_key):
                     key = future_to_key[future]
                     try:
-                        res = future.result()
-                        path = task_map[key][3]
-                        count = get_pdf_page_count(path)
-                        
-                        self.update_count(key, count)
+                        self.update_count(key, future.result())
                         
                         completed_count += 1
                         if callbacks.get('on_progress'):
@@ -326,7 +305,7 @@ class BuildManager:
         self.page_map = projected_offsets
         return [task_map[k][3] for k in ordered_keys]
 
-def create_pdf_metadata(chapters, page_map, output_file):
+def create_pdf_metadata(chapters, page_map, output_file=None):
     bookmarks = []
     
     try:
@@ -351,11 +330,7 @@ def create_pdf_metadata(chapters, page_map, output_file):
                     elif hasattr(item, 'title'):
                         try:
                             pg = reader.get_page_number(item.page)
-                            res.append({
-                                'title': item.title,
-                                'level': current_level,
-                                'page': start_page + pg
-                            })
+                            res.append((item.title, current_level, start_page + pg))
                         except:
                             pass
                 return res
@@ -369,35 +344,44 @@ def create_pdf_metadata(chapters, page_map, output_file):
 
     for key, title in [('cover', 'Cover'), ('preface', 'Preface'), ('outline', 'Table of Contents')]:
         if key in page_map:
-            bookmarks.extend([f'BookmarkBegin', f'BookmarkTitle: {title}', f'BookmarkLevel: 1', f'BookmarkPageNumber: {page_map[key]}'])
+            bookmarks.append((title, 1, page_map[key]))
 
     for ci, ch in chapters:
-        ch_id = str(ch.get('number', ci + 1))
         ch_key = f'chapter-{ci + 1}'
         
         if ch_key in page_map:
             start_pg = page_map[ch_key]
-            bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {ch['title']}", f'BookmarkLevel: 1', f"BookmarkPageNumber: {start_pg}"])
-            
-            pdf_path = BUILD_DIR / f'10_chapter_{ci}_cover.pdf'
-            
-            sub_marks = extract_bookmarks(pdf_path, 1, start_pg)
-            for sm in sub_marks:
-                bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {sm['title']}", f'BookmarkLevel: {sm["level"]}', f"BookmarkPageNumber: {sm['page']}"])
+            bookmarks.append((ch['title'], 1, start_pg))
+            bookmarks.extend(extract_bookmarks(BUILD_DIR / f'10_chapter_{ci}_cover.pdf', 1, start_pg))
 
         for ai, p in enumerate(ch['pages']):
             key = f'{ci}/{ai}'
             if key in page_map:
                 start_pg = page_map[key]
-                bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {p['title']}", f'BookmarkLevel: 2', f"BookmarkPageNumber: {start_pg}"])
-                
-                pdf_path = BUILD_DIR / f'20_page_{ci}_{ai}.pdf'
-                
-                sub_marks = extract_bookmarks(pdf_path, 2, start_pg)
-                for sm in sub_marks:
-                    bookmarks.extend([f'BookmarkBegin', f"BookmarkTitle: {sm['title']}", f'BookmarkLevel: {sm["level"]}', f"BookmarkPageNumber: {sm['page']}"])
+                bookmarks.append((p['title'], 2, start_pg))
+                bookmarks.extend(extract_bookmarks(BUILD_DIR / f'20_page_{ci}_{ai}.pdf', 2, start_pg))
                         
-    Path(output_file).write_text('\n'.join(bookmarks))
+    if output_file:
+        write_bookmarks_file(bookmarks, output_file)
+    return bookmarks
+
+def write_bookmarks_file(bookmarks, bookmarks_file):
+    Path(bookmarks_file).write_text('\n'.join(
+        f'BookmarkBegin\nBookmarkTitle: {t}\nBookmarkLevel: {l}\nBookmarkPageNumber: {pg}' for t, l, pg in bookmarks
+    ))
+
+def read_bookmarks_file(bookmarks_file):
+    lines = Path(bookmarks_file).read_text().split('\n')
+    bookmarks = []
+    for i, line in enumerate(lines):
+        if line.strip() == 'BookmarkBegin' and i + 3 < len(lines):
+            try:
+                t = lines[i + 1].split(': ', 1)[1]
+                l = int(lines[i + 2].split(': ', 1)[1])
+                pg = int(lines[i + 3].split(': ', 1)[1])
+                bookmarks.append((t, l, pg))
+            except:
+                pass
     return bookmarks
 
 def apply_metadata_pypdf(pdf, bookmarks_list, title, author):
@@ -414,24 +398,9 @@ def apply_metadata_pypdf(pdf, bookmarks_list, title, author):
         
         parents = {0: None}
         
-        i = 0
-        while i < len(bookmarks_list):
-            line = bookmarks_list[i]
-            if line == 'BookmarkBegin':
-                try:
-                    t = bookmarks_list[i+1].split(': ', 1)[1]
-                    l = int(bookmarks_list[i+2].split(': ', 1)[1])
-                    pg = int(bookmarks_list[i+3].split(': ', 1)[1])
-                    
-                    parent = parents.get(l - 1, None)
-                    
-                    parents[l] = writer.add_outline_item(t, pg - 1, parent)
-                    
-                    i += 4
-                except:
-                    i += 1
-            else:
-                i += 1
+        for t, l, pg in bookmarks_list:
+            parent = parents.get(l - 1, None)
+            parents[l] = writer.add_outline_item(t, pg - 1, parent)
                 
         writer.write(pdf)
         return True
@@ -440,9 +409,9 @@ def apply_metadata_pypdf(pdf, bookmarks_list, title, author):
         return False
 
 def apply_pdf_metadata(pdf, bookmarks_file, title, author, bookmarks_list=None):
-    lines = bookmarks_list if bookmarks_list else Path(bookmarks_file).read_text().split('\n')
+    bookmarks = bookmarks_list if bookmarks_list is not None else read_bookmarks_file(bookmarks_file)
     
-    if apply_metadata_pypdf(pdf, lines, title, author):
+    if apply_metadata_pypdf(pdf, bookmarks, title, author):
         return True
 
     temp = BUILD_DIR / 'temp.pdf'
@@ -450,6 +419,8 @@ def apply_pdf_metadata(pdf, bookmarks_file, title, author, bookmarks_list=None):
         info = BUILD_DIR / 'info.txt'
         info.write_text(f'InfoBegin\nInfoKey: Title\nInfoValue: {title}\nInfoKey: Author\nInfoValue: {author}\n')
         subprocess.run(['pdftk', str(pdf), 'update_info', str(info), 'output', str(temp)], check=True, capture_output=True)
+        if bookmarks_list is not None:
+            write_bookmarks_file(bookmarks_list, bookmarks_file)
         temp2 = BUILD_DIR / 'temp2.pdf'
         subprocess.run(['pdftk', str(temp), 'update_info', str(bookmarks_file), 'output', str(temp2)], check=True, capture_output=True)
         shutil.move(temp2, pdf)
@@ -457,25 +428,22 @@ def apply_pdf_metadata(pdf, bookmarks_file, title, author, bookmarks_list=None):
     elif shutil.which('gs'):
         pdfmark = BUILD_DIR / 'bookmarks.pdfmark'
         marks = [f'[ /Title ({title}) /Author ({author}) /DOCINFO pdfmark']
-        i = 0
-        while i < len(lines):
-            if lines[i].strip() == 'BookmarkBegin':
-                t = lines[i + 1].split(': ', 1)[1] if ': ' in lines[i + 1] else ''
-                pg = lines[i + 3].split(': ', 1)[1] if ': ' in lines[i + 3] else '1'
-                marks.append(f'[ /Title ({t}) /Page {pg} /Count 0 /OUT pdfmark')
-                i += 4
-            else:
-                i += 1
+        marks.extend(f'[ /Title ({t}) /Page {pg} /Count 0 /OUT pdfmark' for t, _, pg in bookmarks)
         pdfmark.write_text('\n'.join(marks))
         subprocess.run(['gs', '-dBATCH', '-dNOPAUSE', '-q', '-sDEVICE=pdfwrite', f'-sOutputFile={temp}', str(pdf), str(pdfmark)], check=True, capture_output=True)
         shutil.move(temp, pdf)
         return True
     return False
 
+PRECOMPRESSED_EXTS = {'.pdf', '.png', '.jpg', '.jpeg', '.zip', '.gz'}
+
 def zip_build_directory(build_dir, output='build_pdfs.zip'):
     import zipfile
-    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as z:
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as z:
         for root, _, files in os.walk(build_dir):
             for f in files:
                 path = Path(root) / f
-                z.write(path, path.relative_to(build_dir.parent))
\ No newline at end of file
+                if path.suffix.lower() in PRECOMPRESSED_EXTS:
+                    z.write(path, path.relative_to(build_dir.parent), compress_type=zipfile.ZIP_STORED)
+                else:
+                    z.write(path, path.relative_to(build_dir.parent))
\ No newline at end of file
@@ -1,5 +1,6 @@
 import curses
 import json
+import os
 from ..config import CONFIG_FILE, HIERARCHY_FILE, SCHEMES_FILE
 from ..core.templates import restore_templates
 from ..core.sync import sync_hierarchy_with_content
@@ -15,7 +16,7 @@ from .components.build import BuildMenu, run_build_process
 from .components.common import show_error_screen
 
 def needs_init():
-    return not (CONFIG_FILE.exists() and HIERARCHY_FILE.exists() and SCHEMES_FILE.exists())
+    return not all((os.access(p, os.F_OK) for p in (CONFIG_FILE, HIERARCHY_FILE, SCHEMES_FILE)))
 
 def run_build(scr):
     try:
@@ -58,4 +59,11 @@ def run_app(scr, args):
         elif action == 'editor':
             show_editor_menu(scr)
         elif action == 'builder':
-            run_build(scr)
\ No newline at end of file
+            run_build(scr)
+
+def run_session(scr, args):
+    TUI.enter_alt_screen(scr)
+    try:
+        run_app(scr, args)
+    finally:
+        TUI.leave_alt_screen()
@@ -1,13 +1,19 @@
 import curses
+import os
 import sys
 import termios
+from functools import lru_cache
+from unicodedata import east_asian_width
 
 from pathlib import Path
 from ..core.config_mgmt import export_file, import_file, list_exports_for
 from ..utils import register_key, handle_key_event
 from .keybinds import SaveBind, ExitBind, NavigationBind, KeyBind
 
+SYNC_TERMS = ('kitty', 'wezterm', 'ghostty', 'alacritty', 'foot', 'contour', 'iterm')
+
 class TUI:
+    CP, CP1B, CP3B, CP4D = ((0,) * 7, 0, 0, 0)
 
     @staticmethod
     def init_colors():
@@ -18,6 +24,8 @@ class TUI:
         if curses.COLORS >= 256:
             for i in range(16, 256):
                 curses.init_pair(i, i, -1)
+        TUI.CP = tuple((curses.color_pair(i) for i in range(7)))
+        TUI.CP1B, TUI.CP3B, TUI.CP4D = (TUI.CP[1] | curses.A_BOLD, TUI.CP[3] | curses.A_BOLD, TUI.CP[4] | curses.A_DIM)
         curses.curs_set(0)
 
     @staticmethod
@@ -31,29 +39,144 @@ class TUI:
             pass
 
     @staticmethod
-    def safe_addstr(scr, y, x, text, attr=0):
+    def clip_width(text, cols):
+        if text.isascii():
+            return text[:max(0, cols)]
+        n = 0
+        for i, ch in enumerate(text):
+            n += 2 if east_asian_width(ch) in 'WF' else 1
+            if n > cols:
+                return text[:i]
+        return text
+
+    @staticmethod
+    def text_width(text):
+        if text.isascii():
+            return len(text)
+        return sum((2 if east_asian_width(ch) in 'WF' else 1 for ch in text))
+
+    @staticmethod
+    def safe_addstr(scr, y, x, text, attr=0, n=None):
+        try:
+            h, w = scr.getmaxyx()
+            real_y = y + 1
+            real_x = x + 1
+            if 0 <= real_y < h - 1 and 0 <= real_x < w - 1:
+                room = w - 1 - real_x if n is None else min(n, w - 1 - real_x)
+                if room > 0:
+                    scr.addnstr(real_y, real_x, text, room, attr)
+        except curses.error:
+            pass
+
+    @staticmethod
+    def safe_addruns(scr, y, x, runs):
         try:
             h, w = scr.getmaxyx()
             real_y = y + 1
             real_x = x + 1
             if 0 <= real_y < h - 1 and 0 <= real_x < w - 1:
-                scr.addstr(real_y, real_x, text[:w - 1 - real_x], attr)
+                room = w - 1 - real_x
+                scr.move(real_y, real_x)
+                for text, attr in runs:
+                    if room <= 0:
+                        break
+                    scr.addstr(text[:room], attr)
+                    room -= len(text)
         except curses.error:
             pass
 
+    @staticmethod
+    def safe_vline(scr, y, x, n, attr=0):
+        try:
+            h, w = scr.getmaxyx()
+            real_y = y + 1
+            real_x = x + 1
+            if 0 <= real_y < h - 1 and 0 <= real_x < w - 1:
+                scr.vline(real_y, real_x, curses.ACS_VLINE | attr, min(n, h - 1 - real_y))
+        except curses.error:
+            pass
+
+    @staticmethod
+    def safe_addrow(scr, y, x, text, attr, spans=()):
+        try:
+            h, w = scr.getmaxyx()
+            real_y = y + 1
+            real_x = x + 1
+            if 0 <= real_y < h - 1 and 0 <= real_x < w - 1:
+                room = w - 1 - real_x
+                scr.addstr(real_y, real_x, text[:room], attr)
+                for off, n, span_attr in spans:
+                    if off < room:
+                        scr.chgat(real_y, real_x + off, min(n, room - off), span_attr)
+        except curses.error:
+            pass
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def box_rows(w):
+        return ('╔' + '═' * (w - 2) + '╗', '║' + ' ' * (w - 2) + '║', '╚' + '═' * (w - 2) + '╝')
+
     @staticmethod
     def draw_box(scr, y, x, h, w, title=''):
         try:
             real_y, real_x = (y + 1, x + 1)
-            scr.addstr(real_y, real_x, '╔' + '═' * (w - 2) + '╗')
+            top, mid, bot = TUI.box_rows(w)
+            scr.addstr(real_y, real_x, top)
             for i in range(1, h - 1):
-                scr.addstr(real_y + i, real_x, '║' + ' ' * (w - 2) + '║')
-            scr.addstr(real_y + h - 1, real_x, '╚' + '═' * (w - 2) + '╝')
+                scr.addstr(real_y + i, real_x, mid)
+            scr.addstr(real_y + h - 1, real_x, bot)
             if title:
                 scr.addstr(real_y, real_x + 2, f' {title} ', curses.color_pair(1) | curses.A_BOLD)
         except curses.error:
             pass
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def sync_supported():
+        term = f"{os.environ.get('TERM', '')} {os.environ.get('TERM_PROGRAM', '')}".lower()
+        return any((t in term for t in SYNC_TERMS))
+
+    @staticmethod
+    def begin_sync():
+        if TUI.sync_supported():
+            try:
+                sys.stdout.write('\x1b[?2026h')
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def end_sync():
+        if TUI.sync_supported():
+            try:
+                sys.stdout.write('\x1b[?2026l')
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def enter_alt_screen(scr):
+        try:
+            sys.stdout.write('\x1b[?1049h\x1b[?25l')
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+        scr.clearok(True)
+
+    @staticmethod
+    def leave_alt_screen():
+        try:
+            sys.stdout.write('\x1b[?1049l\x1b[?25h')
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def sync_update():
+        TUI.begin_sync()
+        curses.doupdate()
+        TUI.end_sync()
+
     @staticmethod
     def get_dims(scr):
         h_raw, w_raw = scr.getmaxyx()
@@ -176,6 +299,7 @@ class TUI:
 class BaseEditor:
 
     def do_export(self, ctx=None):
+        self._last_shape = None
         from .components.common import LineEditor, show_error_screen
         if not hasattr(self, 'filepath') or not self.filepath:
             return
@@ -196,6 +320,7 @@ class BaseEditor:
             show_error_screen(self.scr, 'Export failed')
 
     def do_import(self, ctx=None):
+        self._last_shape = None
         from .components.common import show_error_screen
         if not hasattr(self, 'filepath') or not self.filepath:
             return
@@ -208,7 +333,7 @@ class BaseEditor:
         by, bx = TUI.center(self.scr, bh, bw)
         sel = 0
         while True:
-            self.scr.clear()
+            self.scr.erase()
             TUI.draw_box(self.scr, by, bx, bh, bw, 'Select Backup')
             for i, b in enumerate(backups):
                 if i >= bh - 4:
@@ -260,11 +385,19 @@ class BaseEditor:
         self.title = title
         self.modified = False
         self.keymap = {}
+        self._last_shape, self._size = (None, None)
+        self._title_key, self._title_str = (None, '')
         TUI.init_colors()
         
         register_key(self.keymap, ExitBind(self.do_exit))
         register_key(self.keymap, SaveBind())
         
+    def title_text(self):
+        key = (self.title, self.modified)
+        if key != self._title_key:
+            self._title_key, self._title_str = (key, f"{self.title}{(' *' if self.modified else '')}")
+        return self._title_str
+
     def do_exit(self, ctx=None):
         if self.modified:
             self.save()
@@ -283,6 +416,8 @@ class BaseEditor:
                 return
             
             k = self.scr.getch()
+            if not isinstance(self.keymap.get(k), NavigationBind):
+                self._last_shape, self._size = (None, None)
             handled, res = handle_key_event(k, self.keymap, self)
             if handled:
                 if res == 'EXIT': return
@@ -296,6 +431,7 @@ class BaseEditor:
         pass
 
 class ListEditor(BaseEditor):
+    footer = 'Esc: Save & Exit'
 
     def __init__(self, scr, title='List Editor'):
         super().__init__(scr, title)
@@ -304,6 +440,7 @@ class ListEditor(BaseEditor):
         self.scroll = 0
         self.box_title = 'Items'
         self.box_width = 70
+        self._drawn = None
         
         register_key(self.keymap, NavigationBind('UP', self.cursor_up))
         register_key(self.keymap, NavigationBind('DOWN', self.cursor_down))
@@ -316,33 +453,46 @@ class ListEditor(BaseEditor):
         raise NotImplementedError
 
     def refresh(self):
-        h, w = self.scr.getmaxyx()
-        self.scr.clear()
-        list_h = min(len(self.items) + 2, h - 8)
-        total_h = 2 + list_h + 2
-        start_y = max(1, (h - total_h) // 2)
-        title_str = f"{self.title}{(' *' if self.modified else '')}"
-        TUI.safe_addstr(self.scr, start_y, (w - len(title_str)) // 2, title_str, curses.color_pair(1) | curses.A_BOLD)
-        bw = min(self.box_width, w - 4)
-        bx = (w - bw) // 2
-        TUI.draw_box(self.scr, start_y + 2, bx, list_h, bw, self.box_title)
+        if self._size is None:
+            self._size = self.scr.getmaxyx()
+        h, w = self._size
+        shape = (h, w, len(self.items), self.modified, self.title)
+        if shape != self._last_shape:
+            self.scr.erase()
+            list_h = min(len(self.items) + 2, h - 8)
+            total_h = 2 + list_h + 2
+            start_y = max(1, (h - total_h) // 2)
+            title_str = self.title_text()
+            TUI.safe_addstr(self.scr, start_y, (w - len(title_str)) // 2, title_str, curses.color_pair(1) | curses.A_BOLD)
+            bw = min(self.box_width, w - 4)
+            bx = (w - bw) // 2
+            TUI.draw_box(self.scr, start_y + 2, bx, list_h, bw, self.box_title)
+            self._draw_footer(h, w)
+            self._layout = (start_y, list_h, bx, bw)
+            self._last_shape, self._drawn = (shape, None)
+        start_y, list_h, bx, bw = self._layout
         vis = list_h - 2
         if self.cursor < self.scroll:
             self.scroll = self.cursor
         elif self.cursor >= self.scroll + vis:
             self.scroll = self.cursor - vis + 1
-        for i in range(vis):
+        if self._drawn is None or self._drawn[0] != self.scroll:
+            rows = range(vis)
+        else:
+            rows = {self._drawn[1] - self.scroll, self.cursor - self.scroll}
+        self._drawn = (self.scroll, self.cursor)
+        blank = TUI.box_rows(bw)[1]
+        for i in rows:
             idx = self.scroll + i
-            if idx >= len(self.items):
-                break
             y = start_y + 3 + i
-            self._draw_item(y, bx, self.items[idx], bw, idx == self.cursor)
-        self._draw_footer(h, w)
-        self.scr.refresh()
+            TUI.safe_addstr(self.scr, y, bx, blank)
+            if idx < len(self.items):
+                self._draw_item(y, bx, self.items[idx], bw, idx == self.cursor)
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     def _draw_footer(self, h, w):
-        footer = 'Esc: Save & Exit'
-        TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
+        TUI.safe_addstr(self.scr, h - 3, (w - len(self.footer)) // 2, self.footer, curses.color_pair(4) | curses.A_DIM)
 
     def cursor_up(self, ctx):
         self.cursor = max(0, self.cursor - 1)
@@ -1,14 +1,72 @@
+import array
 import curses
 import logging
 import shutil
 import json
+import queue
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 from ..base import TUI
-from ...config import LOGO, BUILD_DIR, OUTPUT_FILE, SAD_FACE, HAPPY_FACE, HMM_FACE
+from ...config import LOGO, LOGO_H, LOGO_W, BUILD_DIR, OUTPUT_FILE, SAD_FACE, HAPPY_FACE, HMM_FACE
 from ...utils import load_settings, save_settings, load_config_safe, check_dependencies
 from .common import show_success_screen, copy_to_clipboard, show_error_screen
 from ...core.build import compile_target, merge_pdfs, create_pdf_metadata, apply_pdf_metadata, zip_build_directory, get_pdf_page_count
 
+CH_BOXES = ('[ ]', '[~]', '[✓]')
+CH_BOX_COLORS = (4, 3, 2)
+ITEM_CH, ITEM_PAGE = (0, 1)
+FOOTER = 'Space: Toggle  a/n: All/None  Enter: Build  Esc: Back'
+FOOTER_LEN = len(FOOTER)
+OPT_LINES = (('Debug Mode:   ', ' (d)'), ('Frontmatter:  ', ' (f)'), ('Leave PDFs:   ', ' (l)'))
+OPT_THREADS, OPT_FLAGS = ('Threads:      ', 'Typst Flags:  ')
+BAR_FULL, BAR_EMPTY = ('█' * 256, '░' * 256)
+TYPST_LOG_MAX, TYPST_PAD_W = (200, 256)
+WARNING_RE, ERROR_RE = (re.compile('warning:', re.IGNORECASE), re.compile('error:', re.IGNORECASE))
+
+def typst_line_color(line):
+    return 6 if ERROR_RE.search(line) else 3 if WARNING_RE.search(line) else 4
+
+@dataclass(slots=True)
+class Layout:
+    kind: str
+    logo_y: int
+    logo_x: int
+    logo_n: int
+    opts_y: int
+    opts_x: int
+    opts_w: int
+    list_y: int
+    list_x: int
+    list_w: int
+    list_h: int
+    footer_x: int
+
+def compute_layout(h, w):
+    lh, obh, fx = (LOGO_H, 8, (w - FOOTER_LEN) // 2)
+    if h - lh - 2 - obh - 1 - 5 < 7 and w >= 90:
+        if h >= lh + 3 + obh:
+            start_y, lbw, rbw = (max(0, (h - (lh + 2 + obh) - 2) // 2), min(40, (w - 6) // 2), min(50, (w - 6) // 2))
+            lx, rx = ((w - lbw - rbw - 2) // 2, (w - lbw - rbw - 2) // 2 + lbw + 2)
+            show_logo = h >= lh + 2 + obh
+            oy = start_y + lh + 2 if show_logo else start_y
+            return Layout('horz', start_y, lx + (lbw - LOGO_W) // 2, min(lh, h - 2) if show_logo else 0, oy, lx, lbw, start_y, rx, rbw, min(lh + 2 + obh, h - 2), fx)
+        lw, rw = (20, min(50, w - 24))
+        lx, rx = ((w - lw - rw - 2) // 2, (w - lw - rw - 2) // 2 + lw + 2)
+        return Layout('compact', max(0, (h - lh) // 2 - 1), lx + 3, min(lh, h - 1), 0, rx, rw, obh + 1, rx, rw, max(3, h - obh - 3), fx)
+    hide_logo = h < 36
+    real_lh = lh if not hide_logo else 0
+    total_content_h = (real_lh + 2 if not hide_logo else 0) + obh + 1 + 6 + 2
+    start_y = max(0, (h - total_content_h) // 2)
+    bw, bx = (min(60, w - 4), (w - min(60, w - 4)) // 2)
+    opts_y = max(0, start_y + real_lh + (2 if not hide_logo else 0))
+    cy = opts_y + obh + 1
+    return Layout('vert', start_y, (w - LOGO_W) // 2, real_lh, opts_y, bx, bw, cy, bx, bw, max(4, h - cy - 2), fx)
+
 class BuildMenu:
 
     def __init__(self, scr, hierarchy):
@@ -22,174 +80,294 @@ class BuildMenu:
         default_threads = max(1, (os.cpu_count() or 1) // 2)
         self.threads = settings.get('threads', default_threads)
         self.typst_flags = settings.get('typst_flags', [])
-        saved_pages = set((tuple(p) for p in settings.get('selected_pages', [])))
-        self.items, self.selected = ([], {})
+        saved_pages = frozenset(map(tuple, settings.get('selected_pages', [])))
+        self.items = []
         for ci, ch in enumerate(hierarchy):
             self.items.append(('ch', ci, None))
-            for ai in range(len(ch['pages'])):
-                self.items.append(('art', ci, ai))
-                self.selected[ci, ai] = (ci, ai) in saved_pages if saved_pages else True
+            self.items.extend((('art', ci, ai) for ai in range(len(ch['pages']))))
+        self._item_kind = bytes((ITEM_CH if t == 'ch' else ITEM_PAGE for t, _, _ in self.items))
+        self._item_ci = array.array('i', (ci for _, ci, _ in self.items))
+        self._item_ai = array.array('i', (-1 if ai is None else ai for _, _, ai in self.items))
+        self._ch_total = [len(ch['pages']) for ch in hierarchy]
+        self._ch_header_idx = [i for i, kind in enumerate(self._item_kind) if kind == ITEM_CH]
+        self._all_keys = [(ci, ai) for ci, n in enumerate(self._ch_total) for ai in range(n)]
+        self._ch_off = [0]
+        [self._ch_off.append(self._ch_off[-1] + n) for n in self._ch_total]
+        if saved_pages:
+            self._sel = bytearray(map(saved_pages.__contains__, self._all_keys))
+            self._ch_sel_cnt = [self._sel[off:off + n].count(1) for off, n in zip(self._ch_off, self._ch_total)]
+        else:
+            self._sel = bytearray(b'\x01') * len(self._all_keys)
+            self._ch_sel_cnt = list(self._ch_total)
+        self._selected_sorted = None
+        self._last_static, self._items_box, self._row_sigs = (None, None, {})
+        self._vr, self._pad, self._pad_bw, self._shown_scroll = (0, None, None, 0)
+        self._title_cache, self._title_cache_bw = ({}, None)
+        self._layout_cache = {}
         TUI.init_colors()
         self.h, self.w = scr.getmaxyx()
+        self._save_q, self._saver_thread = (queue.Queue(maxsize=1), None)
+
+    def _settings_snapshot(self):
+        if self._selected_sorted is None:
+            self._selected_sorted = [k for k, v in zip(self._all_keys, self._sel) if v]
+        return {'debug': self.debug, 'frontmatter': self.frontmatter, 'leave_pdfs': self.leave_pdfs, 'typst_flags': self.typst_flags, 'selected_pages': self._selected_sorted, 'threads': self.threads}
+
+    def _saver(self):
+        while True:
+            snap = self._save_q.get()
+            if snap is None:
+                return
+            time.sleep(0.5)
+            while True:
+                try:
+                    nxt = self._save_q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    return
+                snap = nxt
+            save_settings(snap)
+
+    def _queue_save(self):
+        if self._saver_thread is None:
+            self._saver_thread = threading.Thread(target=self._saver, daemon=True)
+            self._saver_thread.start()
+        snap = self._settings_snapshot()
+        while True:
+            try:
+                self._save_q.put_nowait(snap)
+                return
+            except queue.Full:
+                try:
+                    self._save_q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _stop_saver(self):
+        if self._saver_thread is None:
+            return
+        while True:
+            try:
+                self._save_q.get_nowait()
+            except queue.Empty:
+                break
+        self._save_q.put(None)
+        self._saver_thread.join()
+        self._saver_thread = None
 
     def ch_selected(self, ci):
-        return all((self.selected.get((ci, ai), False) for ai in range(len(self.hierarchy[ci]['pages']))))
+        return self._ch_sel_cnt[ci] == self._ch_total[ci]
 
     def ch_partial(self, ci):
-        cnt = sum((1 for ai in range(len(self.hierarchy[ci]['pages'])) if self.selected.get((ci, ai))))
-        return 0 < cnt < len(self.hierarchy[ci]['pages'])
+        return 0 < self._ch_sel_cnt[ci] < self._ch_total[ci]
+
+    def is_selected(self, ci, ai):
+        return self._sel[self._ch_off[ci] + ai]
+
+    def set_page(self, ci, ai, v):
+        i = self._ch_off[ci] + ai
+        if self._sel[i] != v:
+            self._sel[i] = v
+            self._ch_sel_cnt[ci] += 1 if v else -1
+            self._selected_sorted = None
+
+    def set_ch(self, ci, v):
+        off, n = (self._ch_off[ci], self._ch_total[ci])
+        self._sel[off:off + n] = (b'\x01' if v else b'\x00') * n
+        self._ch_sel_cnt[ci] = self._ch_total[ci] if v else 0
+        self._selected_sorted = None
+
+    def toggle_page(self, ci, ai):
+        self.set_page(ci, ai, not self.is_selected(ci, ai))
+        self._row_sigs.pop(self.cursor, None)
+        self._row_sigs.pop(self._ch_header_idx[ci], None)
 
     def toggle_ch(self, ci):
-        v = not self.ch_selected(ci)
-        [self.selected.update({(ci, ai): v}) for ai in range(len(self.hierarchy[ci]['pages']))]
+        self.set_ch(ci, not self.ch_selected(ci))
+
+    def set_all(self, v):
+        self._sel[:] = (b'\x01' if v else b'\x00') * len(self._sel)
+        self._ch_sel_cnt = list(self._ch_total) if v else [0] * len(self._ch_total)
+        self._selected_sorted = None
+
+    def _row_sig(self, idx):
+        ci = self._item_ci[idx]
+        if self._item_kind[idx] == ITEM_CH:
+            state = 2 if self.ch_selected(ci) else 1 if self.ch_partial(ci) else 0
+        else:
+            state = self._sel[self._ch_off[ci] + self._item_ai[idx]]
+        return (idx == self.cursor, state)
+
+    def _scroll_to_cursor(self):
+        if self.cursor < self.scroll:
+            self.scroll = self.cursor
+        elif self.cursor >= self.scroll + self._vr:
+            self.scroll = self.cursor - self._vr + 1
+
+    def _move_cursor(self, delta):
+        self.cursor = max(0, min(len(self.items) - 1, self.cursor + delta))
+        if self._items_box:
+            self._scroll_to_cursor()
+
+    def _title(self, idx, bw):
+        if bw != self._title_cache_bw:
+            self._title_cache, self._title_cache_bw = ({}, bw)
+        title = self._title_cache.get(idx)
+        if title is None:
+            ci, ai = (self._item_ci[idx], self._item_ai[idx])
+            if self._item_kind[idx] == ITEM_CH:
+                ch = self.hierarchy[ci]
+                title, cols, span = (f" Ch {ch.get('number', ci + 1)}: {ch['title']}", bw - 12, bw - 8)
+            else:
+                p = self.hierarchy[ci]['pages'][ai]
+                title, cols, span = (f" {p.get('number', ai + 1)}: {p['title']}", bw - 14, bw - 10)
+            title = TUI.clip_width(title, cols)
+            title += ' ' * (span - TUI.text_width(title))
+            self._title_cache[idx] = title
+        return title
+
+    def _paint_rows(self, bw):
+        if self._pad is None or bw != self._pad_bw:
+            self._pad, self._pad_bw, self._row_sigs = (curses.newpad(len(self._item_kind) + 1, max(1, bw - 1)), bw, {})
+        pad, cp, cp1b, cp3b = (self._pad, TUI.CP, TUI.CP1B, TUI.CP3B)
+        for idx in range(self.scroll, min(self.scroll + self._vr, len(self._item_kind))):
+            sig = self._row_sig(idx)
+            if self._row_sigs.get(idx) == sig:
+                continue
+            self._row_sigs[idx] = sig
+            cur, state = sig
+            marker = '▶' if cur else ' '
+            if self._item_kind[idx] == ITEM_CH:
+                runs = ((f' {marker} ', cp3b), (CH_BOXES[state], cp[CH_BOX_COLORS[state]]), (self._title(idx, bw), cp1b if cur else cp[1]))
+            else:
+                runs = ((f' {marker}   ', cp3b), ('[✓]' if state else '[ ]', cp[2 if state else 4]), (self._title(idx, bw), cp[4] | curses.A_BOLD if cur else cp[4]))
+            try:
+                pad.move(idx, 0)
+                for text, attr in runs:
+                    pad.addstr(text, attr)
+            except curses.error:
+                pass
+
+    def _show_rows(self, full=False):
+        by, bx, bw = self._items_box
+        self._paint_rows(bw)
+        if full or self.scroll != self._shown_scroll:
+            self._pad.touchwin()
+            self._shown_scroll = self.scroll
+        bottom, right = (min(by + 1 + self._vr, self.h - 2), min(bx + bw - 1, self.w - 2))
+        if bottom >= by + 2 and right >= bx + 2:
+            try:
+                self._pad.noutrefresh(self.scroll, 0, by + 2, bx + 2, bottom, right)
+            except curses.error:
+                pass
+
+    def _draw_opts(self, sy, bx, bw):
+        cp, cp4d = (TUI.CP, TUI.CP4D)
+        vals = (self.debug, self.frontmatter, self.leave_pdfs)
+        for i, (l, k) in enumerate(OPT_LINES):
+            v = vals[i]
+            TUI.safe_addruns(self.scr, sy + 1 + i, bx + 2, [(l, cp[4]), ('[ON] ' if v else '[OFF]', cp[2 if v else 6] | curses.A_BOLD), (k, cp4d)])
+        
+        TUI.safe_addruns(self.scr, sy + 4, bx + 2, [(OPT_THREADS, cp[4]), (str(self.threads).ljust(6), cp[5] | curses.A_BOLD), ('(t)', cp4d)])
+
+        flags = ' '.join(self.typst_flags) or '(none)'
+        TUI.safe_addruns(self.scr, sy + 5, bx + 2, [(OPT_FLAGS, cp[4]), (flags[:bw - 20], cp[5 if self.typst_flags else 4] | curses.A_DIM)])
+        TUI.safe_addstr(self.scr, sy + 6, bx + 16, '(c)', cp4d)
 
     def refresh(self):
         self.h, self.w = TUI.get_dims(self.scr)
-        self.scr.clear()
-        lh, obh = (len(LOGO), 8) 
-        vert_ch_rows = self.h - lh - 2 - obh - 1 - 5
-        layout = 'vert'
-        if vert_ch_rows < 7 and self.w >= 90:
-            layout = 'horz' if self.h >= lh + 3 + obh else 'compact'
-
-        def items(by, bx, bw, rows):
-            vr = rows - 2
-            if self.cursor < self.scroll:
-                self.scroll = self.cursor
-            elif self.cursor >= self.scroll + vr:
-                self.scroll = self.cursor - vr + 1
-            for r in range(vr):
-                idx = self.scroll + r
-                if idx >= len(self.items):
-                    break
-                t, ci, ai = self.items[idx]
-                y, cur = (by + 1 + r, idx == self.cursor)
-                if cur:
-                    TUI.safe_addstr(self.scr, y, bx + 2, '▶', curses.color_pair(3) | curses.A_BOLD)
-                if t == 'ch':
-                    ch = self.hierarchy[ci]
-                    cb = '[✓]' if self.ch_selected(ci) else '[~]' if self.ch_partial(ci) else '[ ]'
-                    TUI.safe_addstr(self.scr, y, bx + 4, cb, curses.color_pair(2 if self.ch_selected(ci) else 3 if self.ch_partial(ci) else 4))
-                    TUI.safe_addstr(self.scr, y, bx + 7, f" Ch {ch.get('number', ci + 1)}: {ch['title']}"[:bw - 12], curses.color_pair(1) | (curses.A_BOLD if cur else 0))
-                else:
-                    p = self.hierarchy[ci]['pages'][ai]
-                    sel = self.selected.get((ci, ai), False)
-                    TUI.safe_addstr(self.scr, y, bx + 6, '[✓]' if sel else '[ ]', curses.color_pair(2 if sel else 4))
-                    TUI.safe_addstr(self.scr, y, bx + 9, f" {p.get('number', ai + 1)}: {p['title']}"[:bw - 14], curses.color_pair(4) | (curses.A_BOLD if cur else 0))
-
-        def opts(sy, bx, bw):
-            for i, (l, v, k) in enumerate([('Debug Mode:', self.debug, 'd'), ('Frontmatter:', self.frontmatter, 'f'), ('Leave PDFs:', self.leave_pdfs, 'l')]):
-                TUI.safe_addstr(self.scr, sy + 1 + i, bx + 2, f'{l:14}', curses.color_pair(4))
-                TUI.safe_addstr(self.scr, sy + 1 + i, bx + 16, '[ON] ' if v else '[OFF]', curses.color_pair(2 if v else 6) | curses.A_BOLD)
-                TUI.safe_addstr(self.scr, sy + 1 + i, bx + 22, f'({k})', curses.color_pair(4) | curses.A_DIM)
-            
-            TUI.safe_addstr(self.scr, sy + 4, bx + 2, 'Threads:', curses.color_pair(4))
-            TUI.safe_addstr(self.scr, sy + 4, bx + 16, f'{self.threads}', curses.color_pair(5) | curses.A_BOLD)
-            TUI.safe_addstr(self.scr, sy + 4, bx + 22, '(t)', curses.color_pair(4) | curses.A_DIM)
-
-            flags = ' '.join(self.typst_flags) or '(none)'
-            TUI.safe_addstr(self.scr, sy + 5, bx + 2, 'Typst Flags:', curses.color_pair(4))
-            TUI.safe_addstr(self.scr, sy + 5, bx + 16, flags[:bw - 20], curses.color_pair(5 if self.typst_flags else 4) | curses.A_DIM)
-            TUI.safe_addstr(self.scr, sy + 6, bx + 16, '(c)', curses.color_pair(4) | curses.A_DIM)
-
-        if layout == 'compact':
-            lw, rw = (20, min(50, self.w - 24))
-            lx, rx = ((self.w - lw - rw - 2) // 2, (self.w - lw - rw - 2) // 2 + lw + 2)
-            for i, l in enumerate(LOGO[:self.h - 1]):
-                TUI.safe_addstr(self.scr, max(0, (self.h - lh) // 2 - 1) + i, lx + 3, l, curses.color_pair(1) | curses.A_BOLD)
-            TUI.draw_box(self.scr, 0, rx, obh, rw, 'Options')
-            opts(0, rx, rw)
-            TUI.draw_box(self.scr, obh + 1, rx, max(3, self.h - obh - 3), rw, 'Select Chapters')
-            items(obh + 1, rx, rw, max(3, self.h - obh - 3))
-        elif layout == 'horz':
-            start_y, lbw, rbw = (max(0, (self.h - (lh + 2 + obh) - 2) // 2), min(40, (self.w - 6) // 2), min(50, (self.w - 6) // 2))
-            lx, rx = ((self.w - lbw - rbw - 2) // 2, (self.w - lbw - rbw - 2) // 2 + lbw + 2)
-            
-            if self.h >= lh + 2 + obh:
-                for i, l in enumerate(LOGO[:self.h - 2]):
-                    TUI.safe_addstr(self.scr, start_y + i, lx + (lbw - 14) // 2, l, curses.color_pair(1) | curses.A_BOLD)
-            
-            TUI.draw_box(self.scr, start_y + lh + 2 if self.h >= lh + 2 + obh else start_y, lx, obh, lbw, 'Options')
-            opts(start_y + lh + 2 if self.h >= lh + 2 + obh else start_y, lx, lbw)
-            
-            TUI.draw_box(self.scr, start_y, rx, min(lh + 2 + obh, self.h - 2), rbw, 'Select Chapters')
-            items(start_y, rx, rbw, min(lh + 2 + obh, self.h - 2))
-        else:
-            obh = 8 
-            hide_logo = self.h < 36
-            real_lh = len(LOGO) if not hide_logo else 0
-            
-            total_content_h = (real_lh + 2 if not hide_logo else 0) + obh + 1 + 6 + 2
-            start_y = max(0, (self.h - total_content_h) // 2)
-            
-            if not hide_logo:
-                for i, l in enumerate(LOGO):
-                    TUI.safe_addstr(self.scr, start_y + i, (self.w - 14) // 2, l, curses.color_pair(1) | curses.A_BOLD)
-            
-            bw, bx = (min(60, self.w - 4), (self.w - min(60, self.w - 4)) // 2)
-            
-            spacing = 2 if not hide_logo else 0
-            opts_y = start_y + real_lh + spacing
-            if opts_y < 0: opts_y = 0
-            
-            TUI.draw_box(self.scr, opts_y, bx, obh, bw, 'Options')
-            opts(opts_y, bx, bw)
-            
-            cy = opts_y + obh + 1
-            rem_h = self.h - cy - 2
-            
-            list_h = max(4, rem_h)
-            
-            TUI.draw_box(self.scr, cy, bx, list_h, bw, 'Select Chapters')
-            items(cy, bx, bw, list_h)
-            
-        footer = 'Space: Toggle  a/n: All/None  Enter: Build  Esc: Back'
-        TUI.safe_addstr(self.scr, self.h - 1, (self.w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
-        self.scr.refresh()
+        static = (self.h, self.w, self.debug, self.frontmatter, self.leave_pdfs, self.threads, tuple(self.typst_flags))
+        if static == self._last_static and self._items_box:
+            self._show_rows()
+            curses.doupdate()
+            return
+        self._last_static = static
+        self.scr.erase()
+        lo = self._layout_cache.get((self.h, self.w))
+        if lo is None:
+            lo = self._layout_cache.setdefault((self.h, self.w), compute_layout(self.h, self.w))
+
+        for i, l in enumerate(LOGO[:lo.logo_n]):
+            TUI.safe_addstr(self.scr, lo.logo_y + i, lo.logo_x, l, TUI.CP1B)
+        TUI.draw_box(self.scr, lo.opts_y, lo.opts_x, 8, lo.opts_w, 'Options')
+        self._draw_opts(lo.opts_y, lo.opts_x, lo.opts_w)
+        TUI.draw_box(self.scr, lo.list_y, lo.list_x, lo.list_h, lo.list_w, 'Select Chapters')
+        self._items_box, self._vr = ((lo.list_y, lo.list_x, lo.list_w), lo.list_h - 2)
+        self._scroll_to_cursor()
+
+        TUI.safe_addstr(self.scr, self.h - 1, lo.footer_x, FOOTER, TUI.CP4D)
+        self.scr.noutrefresh()
+        self._show_rows(full=True)
+        curses.doupdate()
 
     def run(self):
         from ..editors import show_editor_menu
         from ..menus import show_keybindings_menu
+        if not TUI.check_terminal_size(self.scr):
+            return None
         self.refresh()
-        while True:
-            if not TUI.check_terminal_size(self.scr):
-                return None
-            k = self.scr.getch()
-            if k == 27:
-                return None
-            elif k == ord('?'):
-                show_keybindings_menu(self.scr)
-            elif k in (ord('\n'), curses.KEY_ENTER, 10):
-                res = {'selected_pages': [(ci, ai) for ci in range(len(self.hierarchy)) for ai in range(len(self.hierarchy[ci]['pages'])) if self.selected.get((ci, ai))], 'debug': self.debug, 'frontmatter': self.frontmatter, 'leave_individual': self.leave_pdfs, 'typst_flags': self.typst_flags, 'threads': self.threads}
-                save_settings({'debug': self.debug, 'frontmatter': self.frontmatter, 'leave_pdfs': self.leave_pdfs, 'typst_flags': self.typst_flags, 'selected_pages': res['selected_pages'], 'threads': self.threads})
-                return res
-            elif k in (curses.KEY_UP, ord('k')):
-                self.cursor = max(0, self.cursor - 1)
-            elif k in (curses.KEY_DOWN, ord('j')):
-                self.cursor = min(len(self.items) - 1, self.cursor + 1)
-            elif k == ord(' '):
-                t, ci, ai = self.items[self.cursor]
-                if t == 'ch':
-                    self.toggle_ch(ci)
-                else:
-                    self.selected[ci, ai] = not self.selected.get((ci, ai), False)
-            elif k == ord('a'):
-                [self.selected.update({(ci, ai): True}) for ci in range(len(self.hierarchy)) for ai in range(len(self.hierarchy[ci]['pages']))]
-            elif k == ord('n'):
-                [self.selected.update({(ci, ai): False}) for ci in range(len(self.hierarchy)) for ai in range(len(self.hierarchy[ci]['pages']))]
-            elif k == ord('d'):
-                self.debug = not self.debug
-            elif k == ord('f'):
-                self.frontmatter = not self.frontmatter
-            elif k == ord('l'):
-                self.leave_pdfs = not self.leave_pdfs
-            elif k == ord('t'):
-                self.configure_threads()
-            elif k == ord('c'):
-                self.configure_flags()
-            elif k == ord('e'):
-                show_editor_menu(self.scr)
-            self.refresh()
+        self.scr.timeout(16)
+        dirty, next_paint = (False, 0.0)
+        try:
+            while True:
+                k = self.scr.getch()
+                if k == 27:
+                    return None
+                elif k == curses.KEY_RESIZE:
+                    if not TUI.check_terminal_size(self.scr):
+                        return None
+                    self._layout_cache.clear()
+                    self._last_static = None
+                elif k == ord('?'):
+                    self.scr.timeout(-1)
+                    show_keybindings_menu(self.scr)
+                    self._last_static = None
+                    self.scr.timeout(16)
+                elif k in (ord('\n'), curses.KEY_ENTER, 10):
+                    self._stop_saver()
+                    snap = self._settings_snapshot()
+                    save_settings(snap)
+                    return {'selected_pages': snap['selected_pages'], 'debug': self.debug, 'frontmatter': self.frontmatter, 'leave_individual': self.leave_pdfs, 'typst_flags': self.typst_flags, 'threads': self.threads}
+                elif k in (curses.KEY_UP, ord('k')):
+                    self._move_cursor(-1)
+                elif k in (curses.KEY_DOWN, ord('j')):
+                    self._move_cursor(1)
+                elif k == ord(' '):
+                    t, ci, ai = self.items[self.cursor]
+                    if t == 'ch':
+                        self.toggle_ch(ci)
+                    else:
+                        self.toggle_page(ci, ai)
+                elif k == ord('a'):
+                    self.set_all(True)
+                elif k == ord('n'):
+                    self.set_all(False)
+                elif k == ord('d'):
+                    self.debug = not self.debug
+                elif k == ord('f'):
+                    self.frontmatter = not self.frontmatter
+                elif k == ord('l'):
+                    self.leave_pdfs = not self.leave_pdfs
+                elif k == ord('t'):
+                    self.configure_threads()
+                    self._last_static = None
+                elif k == ord('c'):
+                    self.configure_flags()
+                    self._last_static = None
+                elif k == ord('e'):
+                    self.scr.timeout(-1)
+                    show_editor_menu(self.scr)
+                    self._last_static = None
+                    self.scr.timeout(16)
+                if k != -1:
+                    dirty = True
+                if dirty and time.monotonic() >= next_paint:
+                    self.refresh()
+                    dirty, next_paint = (False, time.monotonic() + 0.016)
+        finally:
+            self._stop_saver()
+            self.scr.timeout(-1)
             
     def configure_threads(self):
         curses.echo()
@@ -202,7 +380,8 @@ class BuildMenu:
         import os
         d.addstr(3, 2, f'Recommended (50% CPU): {os.cpu_count() // 2}')
         d.addstr(5, 2, 'New count: ')
-        d.refresh()
+        d.noutrefresh()
+        curses.doupdate()
         try:
             s = d.getstr(5, 13, 10).decode('utf-8').strip()
             if s and s.isdigit():
@@ -224,11 +403,13 @@ class BuildMenu:
         d.addstr(2, 2, 'Current: ' + (' '.join(self.typst_flags) or '(none)')[:dw - 12])
         d.addstr(4, 2, '1. --font-path /path  2. --ppi 144  3. Clear')
         d.addstr(6, 2, 'Enter flags or preset: ')
-        d.refresh()
+        d.noutrefresh()
+        curses.doupdate()
         s = d.getstr(6, 25, dw - 27).decode('utf-8').strip()
         if s == '1':
             d.addstr(7, 2, 'Font path: ')
-            d.refresh()
+            d.noutrefresh()
+            curses.doupdate()
             p = d.getstr(7, 13, dw - 15).decode('utf-8').strip()
             if p:
                 self.typst_flags = ['--font-path', p]
@@ -245,39 +426,77 @@ class BuildUI:
 
     def __init__(self, scr, debug=False):
         self.scr, self.debug_mode = (scr, debug)
-        self.logs, self.typst_logs, self.task, self.phase, self.progress, self.total = ([], [], '', '', 0, 0)
+        self.logs, self.typst_logs, self.task, self.phase, self.progress, self.total = (deque(maxlen=20), deque(maxlen=TYPST_LOG_MAX), '', '', 0, 0)
         self.view, self.scroll, self.has_warnings = ('normal', 0, False)
+        self._frame, self._dirty, self.visual_percent = (None, set(), None)
         TUI.init_colors()
-        self.h, self.w = scr.getmaxyx()
+        self._pad, self._pad_y, self._typst_box = (curses.newpad(TYPST_LOG_MAX + 16, TYPST_PAD_W), 0, False)
+        self._pad.scrollok(True)
+        self._pad.setscrreg(0, TYPST_LOG_MAX - 1)
+        self._log_win, self._log_y = (None, 0)
+        self.h, self.w = TUI.get_dims(scr)
 
     def log(self, msg, ok=False):
         self.logs.append((msg, ok))
-        self.logs = self.logs[-20:]
-        self.refresh()
+        if self._log_win is not None and self.view == 'normal':
+            self._log_put(msg, ok)
+        self._dirty.add('log')
+
+    def _log_put(self, msg, ok):
+        win = self._log_win
+        rows, cols = win.getmaxyx()
+        if self._log_y < rows:
+            y, self._log_y = (self._log_y, self._log_y + 1)
+        else:
+            y = rows - 1
+            win.scroll(1)
+        try:
+            win.addnstr(y, 0, ('✓ ' if ok else '  ') + msg, cols - 1, TUI.CP[2 if ok else 4])
+        except curses.error:
+            pass
 
     def debug(self, msg):
         if self.debug_mode:
             self.log(f'[DEBUG] {msg}')
 
     def log_typst(self, out):
-        if out:
-            self.typst_logs.extend([l for l in out.split('\n') if l.strip()])
-            self.typst_logs = self.typst_logs[-200:] 
-            if 'warning:' in out.lower():
+        if out and out.strip():
+            if not self.has_warnings and WARNING_RE.search(out):
                 self.has_warnings = True
+            for line in out.splitlines():
+                if line.strip():
+                    c = typst_line_color(line)
+                    self.typst_logs.append((line, c))
+                    self._pad_put(line, c)
+            if self.view == 'typst':
+                self._dirty.add('log')
+
+    def _pad_put(self, line, c):
+        if self._pad_y < TYPST_LOG_MAX:
+            y, self._pad_y = (self._pad_y, self._pad_y + 1)
+        else:
+            y = TYPST_LOG_MAX - 1
+            self._pad.scroll(1)
+        try:
+            self._pad.addnstr(y, 0, line, TYPST_PAD_W - 1, TUI.CP[c])
+        except curses.error:
+            pass
 
     def set_phase(self, p):
-        self.phase = p
-        self.refresh()
+        if p != self.phase:
+            self.phase = p
+            self._dirty.add('progress')
 
     def set_task(self, t):
-        self.task = t
-        self.refresh()
+        if t != self.task:
+            self.task = t
+            self._dirty.add('progress')
 
     def set_progress(self, p, t, visual_percent=None):
-        self.progress, self.total = (p, t)
-        self.visual_percent = visual_percent
-        self.refresh()
+        if (p, t, visual_percent) != (self.progress, self.total, self.visual_percent):
+            self.progress, self.total = (p, t)
+            self.visual_percent = visual_percent
+            self._dirty.add('progress')
 
     def check_input(self):
         try:
@@ -286,7 +505,10 @@ class BuildUI:
                 return True
             if k == 27:
                 return False
-            if k == ord('v'):
+            if k == curses.KEY_RESIZE:
+                self.h, self.w = TUI.get_dims(self.scr)
+                self._frame = None
+            elif k == ord('v'):
                 self.view = 'typst' if self.view == 'normal' else 'normal'
                 self.scroll = 0
             elif self.view == 'typst':
@@ -294,6 +516,7 @@ class BuildUI:
                     self.scroll = max(0, self.scroll - 1)
                 elif k in (curses.KEY_DOWN, ord('j')):
                     self.scroll = min(max(0, len(self.typst_logs) - 1), self.scroll + 1)
+                self._dirty.add('log')
         except:
             pass
         return True
@@ -301,48 +524,78 @@ class BuildUI:
     def refresh(self):
         if not self.check_input():
             return False
-        self.h, self.w = TUI.get_dims(self.scr)
-        self.scr.clear()
         lh = min(15, self.h - 12)
         total_h = lh + 8
         start_y = max(0, (self.h - total_h) // 2)
-        title = 'NOTEWORTHY BUILD SYSTEM' + (' [DEBUG]' if self.debug_mode else '')
-        TUI.safe_addstr(self.scr, start_y, (self.w - len(title)) // 2, title, curses.color_pair(1) | curses.A_BOLD)
         bw, bx = (min(60, self.w - 4), (self.w - min(60, self.w - 4)) // 2)
+        frame = (self.h, self.w, self.view)
+        if frame != self._frame:
+            self.scr.erase()
+            title = 'NOTEWORTHY BUILD SYSTEM' + (' [DEBUG]' if self.debug_mode else '')
+            TUI.safe_addstr(self.scr, start_y, (self.w - len(title)) // 2, title, curses.color_pair(1) | curses.A_BOLD)
+            footer = 'Esc: Cancel  |  v: Toggle Typst Log'
+            TUI.safe_addstr(self.scr, self.h - 1, (self.w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
+            self._frame, self._dirty, self._typst_box, self._log_win = (frame, {'progress', 'log'}, False, None)
+        if 'progress' in self._dirty:
+            self._draw_progress(start_y, bx, bw)
+        if 'log' in self._dirty:
+            self._draw_log(start_y, bx, bw, lh)
+        if self._dirty:
+            self._dirty.clear()
+            self.scr.noutrefresh()
+            if self._log_win is not None:
+                self._log_win.noutrefresh()
+            elif self.view == 'typst' and self.typst_logs:
+                try:
+                    self._pad.noutrefresh(self.scroll, 0, start_y + 10, bx + 3, min(start_y + 7 + lh, self.h), min(bx + bw - 2, self.w))
+                except curses.error:
+                    pass
+            self._flush()
+        return True
+
+    def _flush(self):
+        TUI.sync_update()
+
+    def _draw_progress(self, start_y, bx, bw):
+        addstr, scr, cp = (TUI.safe_addstr, self.scr, TUI.CP)
         TUI.draw_box(self.scr, start_y + 2, bx, 5, bw, 'Progress')
         if self.phase:
-            TUI.safe_addstr(self.scr, start_y + 3, bx + 2, self.phase[:bw - 4], curses.color_pair(5))
+            addstr(scr, start_y + 3, bx + 2, self.phase[:bw - 4], cp[5])
         if self.task:
-            TUI.safe_addstr(self.scr, start_y + 4, bx + 2, f'→ {self.task}'[:bw - 4], curses.color_pair(4))
+            addstr(scr, start_y + 4, bx + 2, f'→ {self.task}'[:bw - 4], cp[4])
         if self.total:
-            if getattr(self, 'visual_percent', None) is not None:
+            if self.visual_percent is not None:
                 effective_pct = max(0, min(100, self.visual_percent))
             else:
                 effective_prog = min(self.progress, self.total)
                 effective_pct = 100 * effective_prog // self.total
                 
             filled = int((bw - 12) * effective_pct / 100)
-            TUI.safe_addstr(self.scr, start_y + 5, bx + 2, '█' * filled + '░' * (bw - 12 - filled), curses.color_pair(3))
-            TUI.safe_addstr(self.scr, start_y + 5, bx + bw - 8, f'{effective_pct:3d}%', curses.color_pair(3) | curses.A_BOLD)
+            addstr(scr, start_y + 5, bx + 2, BAR_FULL, cp[3], filled)
+            addstr(scr, start_y + 5, bx + 2 + filled, BAR_EMPTY, cp[3], bw - 12 - filled)
+            addstr(scr, start_y + 5, bx + bw - 8, f'{effective_pct:3d}%', cp[3] | curses.A_BOLD)
             count_str = f'({self.progress}/{self.total})'
-            TUI.safe_addstr(self.scr, start_y + 2, bx + bw - 2 - len(count_str), count_str, curses.color_pair(4) | curses.A_DIM)
-            
+            addstr(scr, start_y + 2, bx + bw - 2 - len(count_str), count_str, cp[4] | curses.A_DIM)
+
+    def _draw_log(self, start_y, bx, bw, lh):
+        addstr, scr, cp = (TUI.safe_addstr, self.scr, TUI.CP)
         if self.view == 'typst':
-            TUI.draw_box(self.scr, start_y + 8, bx, lh, bw, 'Typst Output (↑↓ scroll)')
-            if self.typst_logs:
-                for i, line in enumerate(self.typst_logs[self.scroll:self.scroll + lh - 2]):
-                    c = 6 if 'error:' in line.lower() else 3 if 'warning:' in line.lower() else 4
-                    TUI.safe_addstr(self.scr, start_y + 9 + i, bx + 2, line[:bw - 4], curses.color_pair(c))
-            else:
-                TUI.safe_addstr(self.scr, start_y + 9, bx + 2, '(no output yet)', curses.color_pair(4) | curses.A_DIM)
-        else:
+            if not self._typst_box:
+                TUI.draw_box(self.scr, start_y + 8, bx, lh, bw, 'Typst Output (↑↓ scroll)')
+                if not self.typst_logs:
+                    addstr(scr, start_y + 9, bx + 2, '(no output yet)', cp[4] | curses.A_DIM)
+                self._typst_box = True
+        elif self._log_win is None:
             TUI.draw_box(self.scr, start_y + 8, bx, lh, bw, 'Build Log')
-            for i, (msg, ok) in enumerate(self.logs[-(lh - 2):]):
-                TUI.safe_addstr(self.scr, start_y + 9 + i, bx + 2, ('✓ ' if ok else '  ') + msg[:bw - 6], curses.color_pair(2 if ok else 4))
-        footer = 'Esc: Cancel  |  v: Toggle Typst Log'
-        TUI.safe_addstr(self.scr, self.h - 1, (self.w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
-        self.scr.refresh()
-        return True
+            if lh < 3 or bw < 5:
+                return
+            try:
+                self._log_win, self._log_y = (scr.derwin(lh - 2, bw - 3, start_y + 10, bx + 3), 0)
+            except curses.error:
+                return
+            self._log_win.scrollok(True)
+            for msg, ok in islice(self.logs, max(0, len(self.logs) - (lh - 2)), None):
+                self._log_put(msg, ok)
 
 def run_build_process(scr, hierarchy, opts):
     from ...core.build import BuildManager
@@ -355,23 +608,29 @@ def run_build_process(scr, hierarchy, opts):
     scr.nodelay(False)
     scr.timeout(0)
     ui.log('Checking dependencies...')
+    ui.refresh()
     try:
         check_dependencies()
     except SystemExit:
         ui.log('Missing dependencies!', False)
+        ui.refresh()
         curses.napms(2000)
         return
     ui.log('Dependencies OK', True)
+    ui.refresh()
     if BUILD_DIR.exists():
         shutil.rmtree(BUILD_DIR)
     BUILD_DIR.mkdir()
     ui.log('Build directory prepared', True)
     
     pages = opts.get('selected_pages', [])
+    if any((a > b for a, b in zip(pages, islice(pages, 1, None)))):
+        ui.debug('selected pages out of order; sorting')
+        pages = sorted(pages)
     by_ch = {}
     for ci, ai in pages:
         by_ch.setdefault(ci, []).append(ai)
-    chapters = [(i, hierarchy[i]) for i in sorted(by_ch.keys())]
+    chapters = [(i, hierarchy[i]) for i in by_ch]
     ui.log(f'Building {len(pages)} pages from {len(chapters)} chapters', True)
     
     total_tasks = (3 if opts['frontmatter'] else 0) + sum((1 + len(by_ch[ci]) for ci, _ in chapters))
@@ -389,14 +648,17 @@ def run_build_process(scr, hierarchy, opts):
         comp_pct = min(95, int(95 * progress_counter / total_tasks))
         ui.set_progress(progress_counter, total, visual_percent=comp_pct)
         ui.set_task(f"Completed {progress_counter} compilation tasks") 
+        ui.refresh()
         
     def on_log(msg, ok=True):
         ui.log(msg, ok)
+        ui.refresh()
     
     flags = opts.get('typst_flags', [])
     pdfs = []
     current_page_count = 0
     
+    ui.refresh()
     try:
         pdfs = bm.build_parallel(chapters, config, opts, {'on_progress': on_progress, 'on_log': on_log})
         
@@ -428,6 +690,7 @@ def run_build_process(scr, hierarchy, opts):
         
         ui.set_phase('Merging PDFs')
         ui.set_task('Merging...')
+        ui.refresh()
         
         method = merge_pdfs(pdfs, OUTPUT_FILE)
         progress_counter += 1
@@ -442,17 +705,20 @@ def run_build_process(scr, hierarchy, opts):
             
         ui.log(f'Merged with {method}', True)
         ui.set_phase('Adding Metadata')
+        ui.refresh()
         
         bm_file = BUILD_DIR / 'bookmarks.txt'
-        bookmarks_list = create_pdf_metadata(chapters, page_map, bm_file)
+        bookmarks_list = create_pdf_metadata(chapters, page_map)
         apply_pdf_metadata(OUTPUT_FILE, bm_file, 'Noteworthy Framework', 'Sihoo Lee, Lee Hojun', bookmarks_list)
         progress_counter += 1
         ui.set_progress(progress_counter, total, visual_percent=100)
         ui.log('PDF metadata applied', True)
+        ui.refresh()
         
         if opts['leave_individual']:
             zip_build_directory(BUILD_DIR)
             ui.log('Individual PDFs archived', True)
+            ui.refresh()
             
         if OUTPUT_FILE.exists() and BUILD_DIR.exists():
             shutil.rmtree(BUILD_DIR)
@@ -464,7 +730,7 @@ def run_build_process(scr, hierarchy, opts):
         scr.nodelay(False)
         scr.timeout(-1)
         curses.flushinp()
-        show_success_screen(scr, current_page_count - 1, ui.has_warnings, ui.typst_logs)
+        show_success_screen(scr, current_page_count - 1, ui.has_warnings, [line for line, _ in ui.typst_logs])
         
     except Exception as e:
         scr.nodelay(False)
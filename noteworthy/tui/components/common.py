@@ -1,5 +1,7 @@
 import curses
+import shutil
 import subprocess
+import sys
 from ...config import SAD_FACE, HAPPY_FACE, HMM_FACE, OUTPUT_FILE
 from ...utils import register_key, handle_key_event
 from ..base import TUI
@@ -21,6 +23,10 @@ class LineEditor:
         register_key(self.keymap, KeyBind(curses.KEY_RIGHT, self.action_right, "Right"))
         register_key(self.keymap, KeyBind([curses.KEY_DC, 330], self.action_delete, "Delete"))
 
+    def reset(self, title='Edit', initial_value=''):
+        self.title, self.value, self.cursor_pos = (title, initial_value, len(initial_value))
+        return self
+
     def action_cancel(self, ctx):
         return 'EXIT_CANCEL'
 
@@ -65,6 +71,7 @@ class LineEditor:
         
         while True:
             if not TUI.check_terminal_size(self.scr):
+                curses.curs_set(0)
                 return None
                 
             TUI.draw_box(self.scr, box_y, box_x, box_h, box_w, self.title)
@@ -105,32 +112,45 @@ class LineEditor:
             elif 32 <= k <= 126:
                 self.handle_char(chr(k))
 
+CLIPBOARD_CMDS = [
+    (['pbcopy'], 'utf-8'),
+    (['clip'], 'utf-16le'),
+    (['wl-copy'], 'utf-8'),
+    (['xclip', '-selection', 'clipboard'], 'utf-8'),
+    (['xsel', '-b', '-i'], 'utf-8'),
+]
+_clipboard_cmd = None
+
+def find_clipboard_cmd():
+    if sys.platform == 'darwin':
+        candidates = CLIPBOARD_CMDS[:1]
+    elif sys.platform == 'win32':
+        candidates = CLIPBOARD_CMDS[1:2]
+    else:
+        candidates = CLIPBOARD_CMDS[2:]
+    for cmd, enc in candidates:
+        if shutil.which(cmd[0]):
+            return (cmd, enc)
+    return None
+
 def copy_to_clipboard(text):
-    try:
-        subprocess.run(['pbcopy'], input=text.encode('utf-8'), check=True, stderr=subprocess.DEVNULL)
-        return True
-    except:
-        pass
-    try:
-        subprocess.run(['clip'], input=text.encode('utf-16le'), check=True, stderr=subprocess.DEVNULL)
-        return True
-    except:
-        pass
-    try:
-        subprocess.run(['wl-copy'], input=text.encode('utf-8'), check=True, stderr=subprocess.DEVNULL)
-        return True
-    except:
-        pass
-    try:
-        subprocess.run(['xclip', '-selection', 'clipboard'], input=text.encode('utf-8'), check=True, stderr=subprocess.DEVNULL)
-        return True
-    except:
-        pass
-    try:
-        subprocess.run(['xsel', '-b', '-i'], input=text.encode('utf-8'), check=True, stderr=subprocess.DEVNULL)
-        return True
-    except:
-        pass
+    global _clipboard_cmd
+    if _clipboard_cmd is None:
+        _clipboard_cmd = find_clipboard_cmd()
+    if _clipboard_cmd:
+        cmd, enc = _clipboard_cmd
+        try:
+            subprocess.run(cmd, input=text.encode(enc), check=True, stderr=subprocess.DEVNULL)
+            return True
+        except:
+            _clipboard_cmd = None
+    for cmd, enc in CLIPBOARD_CMDS:
+        try:
+            subprocess.run(cmd, input=text.encode(enc), check=True, stderr=subprocess.DEVNULL)
+            _clipboard_cmd = (cmd, enc)
+            return True
+        except:
+            pass
     return False
 
 class LogScreen:
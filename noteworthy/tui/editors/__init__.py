@@ -14,28 +14,28 @@ def show_editor_menu(scr):
         ("p", "Code Snippets", "Edit custom snippets"),
         ("i", "Ignored Files", "Manage ignored files"),
     ]
-    cur = 0
+    cur, size = (0, None)
+    bw, bh = (50, len(options) * 3 + 2)
+    dim = curses.color_pair(4) | curses.A_DIM
     while True:
-        h_raw, w_raw = scr.getmaxyx()
-        h, w = (h_raw - 2, w_raw - 2)
-        scr.clear()
-        bw = 50
-        bh = len(options) * 3 + 2
-        bx = (w - bw) // 2
-        by = (h - bh) // 2
+        if scr.getmaxyx() != size:
+            size = scr.getmaxyx()
+            h, w = (size[0] - 2, size[1] - 2)
+            bx, by = ((w - bw) // 2, (h - bh) // 2)
+        scr.erase()
         TUI.draw_box(scr, by, bx, bh + 2, bw, 'Select Editor')
         for i, (key, label, desc) in enumerate(options):
             y = by + 2 + i * 3
             selected = i == cur
             style = curses.color_pair(2) | curses.A_BOLD if selected else curses.color_pair(4)
-            if selected:
-                TUI.safe_addstr(scr, y, bx + 2, '▶', curses.color_pair(3) | curses.A_BOLD)
-            TUI.safe_addstr(scr, y, bx + 4, f'{label}', style)
-            TUI.safe_addstr(scr, y, bx + bw - 5, f'({key.upper()})', curses.color_pair(4) | curses.A_DIM)
-            TUI.safe_addstr(scr, y + 1, bx + 6, desc, curses.color_pair(4) | curses.A_DIM)
+            row = f"{'▶' if selected else ' '} {label:<{bw - 9}}({key.upper()})"
+            spans = ((0, 1, curses.color_pair(3) | curses.A_BOLD), (bw - 7, 3, dim)) if selected else ((bw - 7, 3, dim),)
+            TUI.safe_addrow(scr, y, bx + 2, row, style, spans)
+            TUI.safe_addstr(scr, y + 1, bx + 6, desc, dim)
         footer = 'Enter: Select  Esc: Back'
-        TUI.safe_addstr(scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
-        scr.refresh()
+        TUI.safe_addstr(scr, h - 3, (w - len(footer)) // 2, footer, dim)
+        scr.noutrefresh()
+        TUI.sync_update()
         k = scr.getch()
         if k == 27:
             return
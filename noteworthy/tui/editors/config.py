@@ -1,5 +1,6 @@
 import curses
 import json
+from functools import lru_cache
 from ..base import ListEditor, TUI
 from ..components.common import LineEditor
 from ...config import CONFIG_FILE, PREFACE_FILE
@@ -8,13 +9,47 @@ from ..keybinds import ConfirmBind, ToggleBind, KeyBind
 from .schemes import extract_themes
 from .text import TextEditor
 
+FIELD_META = (
+    ("title", "Title", "str"),
+    ("subtitle", "Subtitle", "str"),
+    ("authors", "Authors", "list"),
+    ("affiliation", "Affiliation", "str"),
+    ("font", "Body Font", "str"),
+    ("title-font", "Title Font", "str"),
+    ("show-solution", "Show Solutions", "bool"),
+    ("display-cover", "Display Cover", "bool"),
+    ("display-outline", "Display Outline", "bool"),
+    ("display-chap-cover", "Chapter Covers", "bool"),
+    ("chapter-name", "Chapter Label", "str"),
+    ("subchap-name", "Section Label", "str"),
+    ("box-margin", "Box Margin", "str"),
+    ("box-inset", "Box Inset", "str"),
+    ("render-sample-count", "Render Samples", "int"),
+    ("render-implicit-count", "Implicit Samples", "int"),
+    ("pad-chapter-id", "Pad Chapter ID", "bool"),
+    ("pad-page-id", "Pad Page ID", "bool"),
+    ("heading-numbering", "Heading Numbering", "choice", ("1.1", "1.", "I.1", "A.1")),
+)
+FIELD_KEYS = frozenset((meta[0] for meta in FIELD_META))
+DISPLAY = {
+    bool: lambda v: 'Yes' if v else 'No',
+    list: lambda v: ', '.join(v),
+    type(None): lambda v: '(none)',
+}
+
+@lru_cache(maxsize=16)
+def opts_index(opts):
+    return {v: i for i, v in enumerate(opts)}
+
 class ConfigEditor(ListEditor):
+    footer = 'Enter:Edit Space:Toggle Esc:Save x:Export l:Import'
 
     def __init__(self, scr):
         super().__init__(scr, 'General Settings')
         self.config = load_config_safe()
         self.filepath = CONFIG_FILE
         self.themes = extract_themes()
+        self._display_cache = {}
         self._build_items()
         self.box_title = 'Configuration'
         self.box_width = 80
@@ -25,39 +60,10 @@ class ConfigEditor(ListEditor):
         register_key(self.keymap, KeyBind(curses.KEY_LEFT, self.action_prev_value))
 
     def _build_items(self):
-        field_meta = {
-            "title": ("Title", "str"),
-            "subtitle": ("Subtitle", "str"),
-            "authors": ("Authors", "list"),
-            "affiliation": ("Affiliation", "str"),
-            "font": ("Body Font", "str"),
-            "title-font": ("Title Font", "str"),
-            "show-solution": ("Show Solutions", "bool"),
-            "display-cover": ("Display Cover", "bool"),
-            "display-outline": ("Display Outline", "bool"),
-            "display-chap-cover": ("Chapter Covers", "bool"),
-            "chapter-name": ("Chapter Label", "str"),
-            "subchap-name": ("Section Label", "str"),
-            "box-margin": ("Box Margin", "str"),
-            "box-inset": ("Box Inset", "str"),
-            "render-sample-count": ("Render Samples", "int"),
-            "render-implicit-count": ("Implicit Samples", "int"),
-            "pad-chapter-id": ("Pad Chapter ID", "bool"),
-            "pad-page-id": ("Pad Page ID", "bool"),
-            "heading-numbering": ("Heading Numbering", "choice", ["1.1", "1.", "I.1", "A.1"])
-        }
-
-        self.fields = []
-        processed_keys = set()
-        
-        for key, meta in field_meta.items():
-            if key in self.config:
-                 if len(meta) == 3: self.fields.append((key, meta[0], meta[1], meta[2]))
-                 else: self.fields.append((key, meta[0], meta[1]))
-                 processed_keys.add(key)
+        self.fields = [meta for meta in FIELD_META if meta[0] in self.config]
         
         for key, val in self.config.items():
-            if key not in processed_keys and key != 'display-mode':
+            if key not in FIELD_KEYS and key != 'display-mode':
                 if isinstance(val, bool): ftype = "bool"
                 elif isinstance(val, int): ftype = "int"
                 elif isinstance(val, list): ftype = "list"
@@ -68,16 +74,29 @@ class ConfigEditor(ListEditor):
         self.items = self.fields
         self.items.insert(0, ('Preface', 'Edit Preface Content...', 'action'))
 
+    def _set_value(self, key, val):
+        self.config[key] = val
+        self._display_cache.pop(key, None)
+
+    def _display(self, key, ftype):
+        disp = self._display_cache.get(key)
+        if disp is None:
+            val = self.config.get(key)
+            if ftype == 'bool': val = bool(val)
+            disp = self._display_cache[key] = DISPLAY.get(type(val), str)(val)
+        return disp
+
     def save(self):
         try:
             save_config(self.config)
             return True
-        except Exception as e:
+        except (OSError, TypeError, ValueError):
             return False
 
     def _load(self):
         self.config = load_config_safe()
         self.themes = extract_themes()
+        self._display_cache = {}
         self._build_items()
         self.cursor = min(self.cursor, max(0, len(self.items) - 1))
 
@@ -97,31 +116,27 @@ class ConfigEditor(ListEditor):
             TUI.safe_addstr(self.scr, y, x + left_w + 2, label, curses.color_pair(4) | (curses.A_BOLD if selected else 0))
             return
 
-        TUI.safe_addstr(self.scr, y, x + 4, label[:left_w - 6], curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
+        TUI.safe_addstr(self.scr, y, x + 4, label, curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0), left_w - 6)
         
         TUI.safe_addstr(self.scr, y, x + left_w, "│", curses.color_pair(4) | curses.A_DIM)
 
-        val = self.config.get(key)
-        val_str = str(val) if val is not None else "(none)"
+        val_str = self._display(key, ftype)
         
         color = curses.color_pair(4)
         if selected: color = color | curses.A_BOLD
 
         if ftype == 'bool':
-            val_str = 'Yes' if val else 'No'
-            color = curses.color_pair(2 if val else 6)
+            color = curses.color_pair(2 if self.config.get(key) else 6)
             if selected: color = color | curses.A_BOLD
-        elif ftype == 'list':
-            val_str = ', '.join(val) if isinstance(val, list) else str(val)
         elif ftype == 'choice':
              if selected: color = curses.color_pair(5) | curses.A_BOLD
              else: color = curses.color_pair(4)
         
-        TUI.safe_addstr(self.scr, y, x + left_w + 2, val_str[:width - left_w - 4], color)
+        TUI.safe_addstr(self.scr, y, x + left_w + 2, val_str, color, width - left_w - 4)
 
     def refresh(self):
         h, w = TUI.get_dims(self.scr)
-        self.scr.clear()
+        self.scr.erase()
         
         list_h = min(len(self.items) + 2, h - 8)
         total_h = 2 + list_h + 2
@@ -129,7 +144,7 @@ class ConfigEditor(ListEditor):
         cy, cx = TUI.center(self.scr, total_h, self.box_width)
         start_y = cy + 1
         
-        title_str = f"{self.title}{' *' if self.modified else ''}"
+        title_str = self.title_text()
         ty, tx = TUI.center(self.scr, content_w=len(title_str))
         TUI.safe_addstr(self.scr, start_y, tx, title_str, curses.color_pair(1) | curses.A_BOLD)
         
@@ -148,44 +163,27 @@ class ConfigEditor(ListEditor):
         if self.cursor < self.scroll: self.scroll = self.cursor
         elif self.cursor >= self.scroll + vis: self.scroll = self.cursor - vis + 1
         
-        for i in range(vis):
-            idx = self.scroll + i
-            if idx >= len(self.items): break
-            y = start_y + 4 + i
-            self._draw_item(y, bx, self.items[idx], bw, idx == self.cursor)
+        for i, item in enumerate(self.items[self.scroll:self.scroll + vis]):
+            self._draw_item(start_y + 4 + i, bx, item, bw, self.scroll + i == self.cursor)
             
         self._draw_footer(h, w)
-        self.scr.refresh()
-
-    def _draw_footer(self, h, w):
-        footer = 'Enter:Edit Space:Toggle Esc:Save x:Export l:Import'
-        TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     def action_edit(self, ctx):
-        item = self.items[self.cursor]
-        key = item[0]
-        if len(item) == 4: _, label, ftype, opts = item
-        else: _, label, ftype = item
+        key, label, ftype, *opts = self.items[self.cursor]
 
         if key == 'Preface':
             editor = TextEditor(self.scr, filepath=PREFACE_FILE, title='Preface Editor')
             editor.run()
-        elif ftype == 'choice':
-            val = self.config.get(key, opts[0])
-            try: idx = opts.index(val)
-            except: idx = 0
-            idx = (idx + 1) % len(opts)
-            self.config[key] = opts[idx]
-            self.modified = True
-        elif ftype == 'bool':
-            self.config[key] = not self.config.get(key, False)
-            self.modified = True
+        elif ftype in ('choice', 'bool'):
+            self._cycle_value(key, ftype, *opts)
         elif ftype == 'list':
             val = self.config.get(key, [])
             curr = ', '.join(val)
             new_val = LineEditor(self.scr, initial_value=curr, title=f'Edit {label}').run()
             if new_val is not None:
-                self.config[key] = [s.strip() for s in new_val.split(',') if s.strip()]
+                self._set_value(key, [s.strip() for s in new_val.split(',') if s.strip()])
                 self.modified = True
         else:
             val = self.config.get(key)
@@ -195,59 +193,37 @@ class ConfigEditor(ListEditor):
             
             if new_val is not None:
                 if ftype == 'int':
-                    try: 
-                        if not new_val: self.config[key] = None
-                        else: self.config[key] = int(new_val)
-                    except ValueError:
-                         pass
+                    digits = new_val.strip()
+                    if digits[:1] in ('+', '-'): digits = digits[1:]
+                    if not new_val: self._set_value(key, None)
+                    elif digits.isdecimal(): self._set_value(key, int(new_val))
                 else:
                     if not new_val:
-                        self.config[key] = None
+                        self._set_value(key, None)
                     else:
-                        self.config[key] = new_val
+                        self._set_value(key, new_val)
                 self.modified = True
     
-    def action_toggle(self, ctx):
-        item = self.items[self.cursor]
-        key = item[0]
-        if len(item) == 4: _, label, ftype, opts = item
-        else: _, label, ftype = item
-        
+    def _cycle_value(self, key, ftype, opts=None, direction=1):
         if ftype == 'bool':
-            self.config[key] = not self.config.get(key, False)
-            self.modified = True
+            self._set_value(key, not self.config.get(key, False))
         elif ftype == 'choice':
-            val = self.config.get(key, opts[0])
-            try: idx = opts.index(val)
-            except: idx = 0
-            idx = (idx + 1) % len(opts)
-            self.config[key] = opts[idx]
-            self.modified = True
+            idx = opts_index(opts).get(self.config.get(key), 0)
+            self._set_value(key, opts[(idx + direction) % len(opts)])
+        else:
+            return
+        self.modified = True
 
-    def action_next_value(self, ctx):
-        item = self.items[self.cursor]
-        key = item[0]
-        if len(item) == 4: _, label, ftype, opts = item
-        else: _, label, ftype = item
+    def action_toggle(self, ctx):
+        key, _, ftype, *opts = self.items[self.cursor]
+        self._cycle_value(key, ftype, *opts)
 
+    def action_next_value(self, ctx):
+        key, _, ftype, *opts = self.items[self.cursor]
         if ftype == 'choice':
-            val = self.config.get(key, opts[0])
-            try: idx = opts.index(val)
-            except: idx = 0
-            idx = (idx + 1) % len(opts)
-            self.config[key] = opts[idx]
-            self.modified = True
+            self._cycle_value(key, ftype, *opts)
     
     def action_prev_value(self, ctx):
-        item = self.items[self.cursor]
-        key = item[0]
-        if len(item) == 4: _, label, ftype, opts = item
-        else: _, label, ftype = item
-
+        key, _, ftype, *opts = self.items[self.cursor]
         if ftype == 'choice':
-            val = self.config.get(key, opts[0])
-            try: idx = opts.index(val)
-            except: idx = 0
-            idx = (idx - 1 + len(opts)) % len(opts)
-            self.config[key] = opts[idx]
-            self.modified = True
\ No newline at end of file
+            self._cycle_value(key, ftype, *opts, direction=-1)
@@ -4,12 +4,13 @@ from ..base import ListEditor, TUI
 from ..components.common import LineEditor
 from ..keybinds import ConfirmBind, KeyBind
 from ...config import HIERARCHY_FILE
-from ...utils import load_config_safe, register_key
+from ...utils import load_config_safe, register_key, load_json_cached, invalidate_json_cache
 
 class HierarchyEditor(ListEditor):
+    footer = "Enter: Edit  d: Delete  Esc: Save & Exit  x: Export  l: Import"
     def __init__(self, scr):
         super().__init__(scr, "Chapter Structure")
-        self.hierarchy = json.loads(HIERARCHY_FILE.read_text())
+        self.hierarchy = load_json_cached(HIERARCHY_FILE)
         self.config = load_config_safe()
         self.filepath = HIERARCHY_FILE
         self._build_items()
@@ -20,7 +21,7 @@ class HierarchyEditor(ListEditor):
         register_key(self.keymap, KeyBind(ord('d'), self.action_delete, "Delete Item"))
     
     def _build_items(self):
-        self.items = []
+        self.items.clear()
         for ci, ch in enumerate(self.hierarchy):
             self.items.append(("ch_title", ci, None, ch))
             self.items.append(("ch_number", ci, None, ch))
@@ -59,7 +60,7 @@ class HierarchyEditor(ListEditor):
         elif t == "ch_summary": self.hierarchy[ci]["summary"] = val
         elif t == "pg_title": self.hierarchy[ci]["pages"][pi]["title"] = val
         
-        self.modified = True; self._build_items()
+        self.modified = True
     
     def _add_chapter(self):
         new_ch = {"title": "New Chapter", "summary": "", "pages": []}
@@ -91,12 +92,13 @@ class HierarchyEditor(ListEditor):
             self.cursor = min(self.cursor, len(self.items) - 1)
     
     def _load(self):
-        self.hierarchy = json.loads(HIERARCHY_FILE.read_text())
+        self.hierarchy = load_json_cached(HIERARCHY_FILE)
         self._build_items()
 
     def save(self):
         try:
             HIERARCHY_FILE.write_text(json.dumps(self.hierarchy, indent=4))
+            invalidate_json_cache()
             self.modified = False
             
             from ...core.fs_sync import ensure_content_structure, cleanup_extra_files
@@ -104,11 +106,11 @@ class HierarchyEditor(ListEditor):
             cleanup_extra_files(self.hierarchy)
             
             return True
-        except: return False
+        except (OSError, TypeError, ValueError): return False
 
     def refresh(self):
         h, w = TUI.get_dims(self.scr)
-        self.scr.clear()
+        self.scr.erase()
         
         list_h = min(len(self.items) + 2, h - 8)
         total_h = 2 + list_h + 2
@@ -116,7 +118,7 @@ class HierarchyEditor(ListEditor):
         cy, cx = TUI.center(self.scr, total_h, self.box_width)
         start_y = cy + 1 
         
-        title_str = f"{self.title}{' *' if self.modified else ''}"
+        title_str = self.title_text()
         ty, tx = TUI.center(self.scr, content_w=len(title_str))
         TUI.safe_addstr(self.scr, start_y, tx, title_str, curses.color_pair(1) | curses.A_BOLD)
         
@@ -129,21 +131,18 @@ class HierarchyEditor(ListEditor):
         TUI.safe_addstr(self.scr, start_y + 3, bx + 4, "Item", curses.color_pair(1) | curses.A_BOLD)
         TUI.safe_addstr(self.scr, start_y + 3, bx + left_w + 2, "Value", curses.color_pair(1) | curses.A_BOLD)
         
-        for i in range(1, list_h - 1):
-            TUI.safe_addstr(self.scr, start_y + 2 + i, bx + left_w, "│", curses.color_pair(4) | curses.A_DIM)
+        TUI.safe_vline(self.scr, start_y + 3, bx + left_w, list_h - 2, curses.color_pair(4) | curses.A_DIM)
             
         vis = list_h - 3
         if self.cursor < self.scroll: self.scroll = self.cursor
         elif self.cursor >= self.scroll + vis: self.scroll = self.cursor - vis + 1
         
-        for i in range(vis):
-            idx = self.scroll + i
-            if idx >= len(self.items): break
-            y = start_y + 4 + i
-            self._draw_item(y, bx, self.items[idx], bw, idx == self.cursor)
+        for i, item in enumerate(self.items[self.scroll:self.scroll + vis]):
+            self._draw_item(start_y + 4 + i, bx, item, bw, self.scroll + i == self.cursor)
             
         self._draw_footer(h, w)
-        self.scr.refresh()
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     def _draw_item(self, y, x, item, width, selected):
         t, ci, pi, _ = item
@@ -165,32 +164,32 @@ class HierarchyEditor(ListEditor):
             label = self.config.get("chapter-name", "Chapter")
             label_disp = f"{label} {ch_num}"
             
-            TUI.safe_addstr(self.scr, y, x + 4, label_disp[:left_w-6], curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
+            TUI.safe_addstr(self.scr, y, x + 4, label_disp, curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0), left_w-6)
             
             val = str(self._get_value(item))
-            TUI.safe_addstr(self.scr, y, val_x, val[:width-left_w-6], curses.color_pair(4) | (curses.A_BOLD if selected else 0))
+            TUI.safe_addstr(self.scr, y, val_x, val, curses.color_pair(4) | (curses.A_BOLD if selected else 0), width-left_w-6)
             
         elif t == "ch_number":
             TUI.safe_addstr(self.scr, y, x + 6, "Number", curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
             val = str(self._get_value(item))
             if not val: val = "(auto)"
-            TUI.safe_addstr(self.scr, y, val_x, val[:width-left_w-6], curses.color_pair(4) | (curses.A_BOLD if selected else curses.A_DIM))
+            TUI.safe_addstr(self.scr, y, val_x, val, curses.color_pair(4) | (curses.A_BOLD if selected else curses.A_DIM), width-left_w-6)
             
         elif t == "ch_summary":
             TUI.safe_addstr(self.scr, y, x + 6, "Summary", curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
             val = str(self._get_value(item))
-            TUI.safe_addstr(self.scr, y, val_x, val[:width-left_w-6], curses.color_pair(4) | (curses.A_BOLD if selected else 0))
+            TUI.safe_addstr(self.scr, y, val_x, val, curses.color_pair(4) | (curses.A_BOLD if selected else 0), width-left_w-6)
             
         elif t == "pg_title":
             TUI.safe_addstr(self.scr, y, x + 6, "Page Title", curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
             val = str(self._get_value(item))
-            TUI.safe_addstr(self.scr, y, val_x, val[:width-left_w-6], curses.color_pair(4) | (curses.A_BOLD if selected else 0))
+            TUI.safe_addstr(self.scr, y, val_x, val, curses.color_pair(4) | (curses.A_BOLD if selected else 0), width-left_w-6)
             
         elif t == "pg_number":
             TUI.safe_addstr(self.scr, y, x + 8, "Page Num", curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
             val = str(self._get_value(item))
             if not val: val = "(auto)"
-            TUI.safe_addstr(self.scr, y, val_x, val[:width-left_w-6], curses.color_pair(4) | (curses.A_BOLD if selected else curses.A_DIM))
+            TUI.safe_addstr(self.scr, y, val_x, val, curses.color_pair(4) | (curses.A_BOLD if selected else curses.A_DIM), width-left_w-6)
             
         elif t == "add_page":
             TUI.safe_addstr(self.scr, y, x + 6, "+ Add page...", curses.color_pair(3 if selected else 4) | (curses.A_BOLD if selected else curses.A_DIM))
@@ -198,10 +197,6 @@ class HierarchyEditor(ListEditor):
         elif t == "add_chapter":
             TUI.safe_addstr(self.scr, y, x + 4, "+ Add chapter...", curses.color_pair(3 if selected else 4) | (curses.A_BOLD if selected else curses.A_DIM))
 
-    def _draw_footer(self, h, w):
-        footer = "Enter: Edit  d: Delete  Esc: Save & Exit  x: Export  l: Import"
-        TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
-
     def action_edit(self, ctx):
         item = self.items[self.cursor]; t, ci, pi, _ = item
         if t == "add_chapter": self._add_chapter()
@@ -1,16 +1,18 @@
 import curses
+from bisect import insort
 from ..base import ListEditor, TUI
 from ...config import INDEXIGNORE_FILE
 from ..components.common import LineEditor
-from ...utils import load_indexignore, save_indexignore, register_key
+from ...utils import load_indexignore_sorted, save_indexignore, register_key
 from ..keybinds import ConfirmBind, KeyBind
 
 class IndexignoreEditor(ListEditor):
+    footer = 'Enter:Edit n:Add d:Del Esc:Save x:Export l:Import'
 
     def __init__(self, scr):
         super().__init__(scr, 'Ignored Files')
         self.filepath = INDEXIGNORE_FILE
-        self.ignored = sorted(list(load_indexignore()))
+        self.ignored = load_indexignore_sorted()
         self._update_items()
         self.box_title = 'Ignored Files'
         self.box_width = 50
@@ -26,16 +28,15 @@ class IndexignoreEditor(ListEditor):
             curr = self.ignored[self.cursor]
             new_val = LineEditor(self.scr, initial_value=curr, title="Edit Pattern").run()
             if new_val is not None:
-                self.ignored[self.cursor] = new_val
-                self.ignored.sort()
+                del self.ignored[self.cursor]
+                insort(self.ignored, new_val)
                 self._update_items()
                 self.modified = True
 
     def action_add(self, ctx):
         val = LineEditor(self.scr, title='Ignore File ID').run()
         if val and val not in self.ignored:
-            self.ignored.append(val)
-            self.ignored.sort()
+            insort(self.ignored, val)
             self._update_items()
             self.modified = True
             
@@ -49,7 +50,8 @@ class IndexignoreEditor(ListEditor):
                 self.cursor = min(choice, len(self.items) - 1)
 
     def _update_items(self):
-        self.items = self.ignored + ["+ Add new ignore pattern..."]
+        self.items[:] = self.ignored
+        self.items.append("+ Add new ignore pattern...")
 
     def save(self):
         save_indexignore(set(self.ignored))
@@ -57,7 +59,7 @@ class IndexignoreEditor(ListEditor):
         return True
 
     def _load(self):
-        self.ignored = sorted(list(load_indexignore()))
+        self.ignored = load_indexignore_sorted()
         self._update_items()
 
     def _draw_item(self, y, x, item, width, selected):
@@ -69,7 +71,3 @@ class IndexignoreEditor(ListEditor):
         if selected:
             TUI.safe_addstr(self.scr, y, x + 2, '>', curses.color_pair(3) | curses.A_BOLD)
         TUI.safe_addstr(self.scr, y, x + 4, item, curses.color_pair(5 if selected else 4))
-
-    def _draw_footer(self, h, w):
-        footer = 'Enter:Edit n:Add d:Del Esc:Save x:Export l:Import'
-        TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
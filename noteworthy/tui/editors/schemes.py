@@ -1,60 +1,73 @@
 import curses
 import json
+from bisect import bisect_right
+from functools import lru_cache
 from ..base import ListEditor, TUI
 from ..components.common import LineEditor
 from ...config import SCHEMES_FILE
-from ...utils import load_config_safe, save_config, register_key
+from ...utils import load_config_safe, save_config, register_key, load_json_cached, invalidate_json_cache
 from ..keybinds import ConfirmBind, KeyBind
 
+@lru_cache(maxsize=1)
+def _theme_names(mtime_ns, size):
+    return tuple(load_json_cached(SCHEMES_FILE, mutable=False).keys())
+
 def extract_themes():
     try:
-        schemes = json.loads(SCHEMES_FILE.read_text())
-        return list(schemes.keys())
-    except:
+        st = SCHEMES_FILE.stat()
+        return list(_theme_names(st.st_mtime_ns, st.st_size))
+    except (OSError, ValueError, AttributeError):
         return []
 
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+CUBE_CUTS = (48, 116, 156, 196, 236)
+
+def _nearest_256(r, g, b):
+    ri, gi, bi = (bisect_right(CUBE_CUTS, r), bisect_right(CUBE_CUTS, g), bisect_right(CUBE_CUTS, b))
+    best_idx = 16 + 36 * ri + 6 * gi + bi
+    best_dist = (r - CUBE_LEVELS[ri]) ** 2 + (g - CUBE_LEVELS[gi]) ** 2 + (b - CUBE_LEVELS[bi]) ** 2
+    i0 = min(23, max(0, ((r + g + b) / 3 - 8) // 10))
+    for i in (int(i0), int(i0) + 1):
+        if i > 23:
+            break
+        val = 8 + 10 * i
+        dist = (r - val) ** 2 + (g - val) ** 2 + (b - val) ** 2
+        if dist < best_dist:
+            best_dist = dist
+            best_idx = 232 + i
+    return best_idx
+
+@lru_cache(maxsize=256)
+def _rgb_to_color(rgb, colors):
+    r, g, b = (rgb >> 16, (rgb >> 8) & 255, rgb & 255)
+    if colors < 256:
+        lum = 0.299 * r + 0.587 * g + 0.114 * b
+        if lum > 180:
+            return 4
+        if r > g and r > b:
+            return 6
+        if g > r and g > b:
+            return 2
+        if b > r and b > g:
+            return 1
+        if r > 150 and g > 100:
+            return 3
+        return 5
+    return _nearest_256(r, g, b)
+
 def hex_to_curses_color(hex_color):
-    if not hex_color or not hex_color.startswith('#'):
-        return 4
-    try:
-        r = int(hex_color[1:3], 16)
-        g = int(hex_color[3:5], 16)
-        b = int(hex_color[5:7], 16)
-        if curses.COLORS < 256:
-            lum = 0.299 * r + 0.587 * g + 0.114 * b
-            if lum > 180:
-                return 4
-            if r > g and r > b:
-                return 6
-            if g > r and g > b:
-                return 2
-            if b > r and b > g:
-                return 1
-            if r > 150 and g > 100:
-                return 3
-            return 5
-        best_idx = 16
-        best_dist = 1000000
-        levels = [0, 95, 135, 175, 215, 255]
-        for ri, rv in enumerate(levels):
-            for gi, gv in enumerate(levels):
-                for bi, bv in enumerate(levels):
-                    idx = 16 + 36 * ri + 6 * gi + bi
-                    dist = (r - rv) ** 2 + (g - gv) ** 2 + (b - bv) ** 2
-                    if dist < best_dist:
-                        best_dist = dist
-                        best_idx = idx
-        for i in range(24):
-            val = 8 + 10 * i
-            dist = (r - val) ** 2 + (g - val) ** 2 + (b - val) ** 2
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = 232 + i
-        return best_idx
-    except:
+    return _hex_to_color(hex_color, getattr(curses, 'COLORS', 8))
+
+@lru_cache(maxsize=256)
+def _hex_to_color(hex_color, colors):
+    hex_color = hex_color.strip() if hex_color else hex_color
+    if not hex_color or not hex_color.startswith('#') or len(hex_color) < 7 or not HEX_DIGITS.issuperset(hex_color[1:7]):
         return 4
+    return _rgb_to_color(int(hex_color[1:7], 16), colors)
 
 class ThemeDetailEditor(ListEditor):
+    footer = 'Enter: Select  Esc: Save & Exit'
 
     def __init__(self, scr, schemes, theme_name):
         super().__init__(scr, f'Editing \"{theme_name}\"')
@@ -76,10 +89,14 @@ class ThemeDetailEditor(ListEditor):
         new_val = LineEditor(self.scr, initial_value=curr_val, title='Edit Color').run()
         if new_val is not None:
             self._set_value(key, new_val)
-            self._build_items()
+            self._rebuild_item(self.cursor)
+
+    def _rebuild_item(self, idx):
+        key = self.items[idx][0]
+        self.items[idx] = (key, self._get_value(key))
 
     def _build_items(self):
-        self.items = []
+        self.items.clear()
         for key in ['page-fill', 'text-main', 'text-heading', 'text-muted', 'text-accent']:
             self.items.append((key, self.theme.get(key, '')))
         for block, data in self.theme.get('blocks', {}).items():
@@ -131,52 +148,47 @@ class ThemeDetailEditor(ListEditor):
         return key
 
     def refresh(self):
+        addstr, scr, cp = (TUI.safe_addstr, self.scr, TUI.CP)
         h, w = self.scr.getmaxyx()
-        self.scr.clear()
+        self.scr.erase()
         list_h = min(len(self.items) + 3, h - 8)
         total_h = 3 + list_h + 2
         start_y = max(1, (h - total_h) // 2)
-        title_str = f"{self.title}{(' *' if self.modified else '')}"
-        TUI.safe_addstr(self.scr, start_y, (w - len(title_str)) // 2, title_str, curses.color_pair(1) | curses.A_BOLD)
+        title_str = self.title_text()
+        addstr(scr, start_y, (w - len(title_str)) // 2, title_str, cp[1] | curses.A_BOLD)
         bw = min(self.box_width, w - 4)
         bx = (w - bw) // 2
         left_w = 22
         TUI.draw_box(self.scr, start_y + 2, bx, list_h, bw, self.box_title)
-        TUI.safe_addstr(self.scr, start_y + 3, bx + 4, 'Property', curses.color_pair(1) | curses.A_BOLD)
-        TUI.safe_addstr(self.scr, start_y + 3, bx + left_w + 2, 'Color', curses.color_pair(1) | curses.A_BOLD)
-        for i in range(1, list_h - 1):
-            TUI.safe_addstr(self.scr, start_y + 2 + i, bx + left_w, '│', curses.color_pair(4) | curses.A_DIM)
+        addstr(scr, start_y + 3, bx + 4, 'Property', cp[1] | curses.A_BOLD)
+        addstr(scr, start_y + 3, bx + left_w + 2, 'Color', cp[1] | curses.A_BOLD)
+        TUI.safe_vline(scr, start_y + 3, bx + left_w, list_h - 2, cp[4] | curses.A_DIM)
         vis = list_h - 3
         if self.cursor < self.scroll:
             self.scroll = self.cursor
         elif self.cursor >= self.scroll + vis:
             self.scroll = self.cursor - vis + 1
-        for i in range(vis):
-            idx = self.scroll + i
-            if idx >= len(self.items):
-                break
-            y = start_y + 4 + i
-            self._draw_item(y, bx, self.items[idx], bw, idx == self.cursor)
+        for i, item in enumerate(self.items[self.scroll:self.scroll + vis]):
+            self._draw_item(start_y + 4 + i, bx, item, bw, self.scroll + i == self.cursor)
         self._draw_footer(h, w)
-        self.scr.refresh()
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     def _draw_item(self, y, x, item, width, selected):
+        addstr, scr, cp = (TUI.safe_addstr, self.scr, TUI.CP)
         key, _ = item
         left_w = 22
         if selected:
-            TUI.safe_addstr(self.scr, y, x + 2, '>', curses.color_pair(3) | curses.A_BOLD)
+            addstr(scr, y, x + 2, '>', cp[3] | curses.A_BOLD)
         label = self._get_label(key)
-        TUI.safe_addstr(self.scr, y, x + 4, label[:left_w - 6], curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
+        addstr(scr, y, x + 4, label, cp[5 if selected else 4] | (curses.A_BOLD if selected else 0), left_w - 6)
         hex_val = self._get_value(key)
         color = hex_to_curses_color(hex_val)
-        TUI.safe_addstr(self.scr, y, x + left_w + 2, '██', curses.color_pair(color))
-        TUI.safe_addstr(self.scr, y, x + left_w + 5, hex_val[:width - left_w - 8], curses.color_pair(4) | (curses.A_BOLD if selected else 0))
-
-    def _draw_footer(self, h, w):
-        footer = 'Enter: Select  Esc: Save & Exit'
-        TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
+        addstr(scr, y, x + left_w + 2, '██', curses.color_pair(color))
+        addstr(scr, y, x + left_w + 5, hex_val, cp[4] | (curses.A_BOLD if selected else 0), width - left_w - 8)
 
 class SchemeEditor(ListEditor):
+    footer = 'Enter: Edit  Space: Set Active  n: New  d: Delete  Esc: Save & Exit  x: Export  l: Import'
 
     def __init__(self, scr):
         super().__init__(scr, 'Color Themes')
@@ -211,7 +223,7 @@ class SchemeEditor(ListEditor):
                 save_config(self.config)
 
     def _load_schemes(self):
-        return json.loads(SCHEMES_FILE.read_text())
+        return load_json_cached(SCHEMES_FILE)
 
     def _load(self):
         self.schemes = self._load_schemes()
@@ -219,14 +231,16 @@ class SchemeEditor(ListEditor):
         self.cursor = min(self.cursor, max(0, len(self.items) - 1))
 
     def _build_items(self):
-        self.items = sorted(list(self.schemes.keys())) + ['+ Add new scheme...']
+        self.items[:] = sorted(self.schemes)
+        self.items.append('+ Add new scheme...')
 
     def save(self):
         try:
             SCHEMES_FILE.write_text(json.dumps(self.schemes, indent=4))
+            invalidate_json_cache()
             self.modified = False
             return True
-        except:
+        except (OSError, TypeError, ValueError):
             return False
 
     def _create_new(self):
@@ -287,11 +301,11 @@ class SchemeEditor(ListEditor):
 
     def refresh(self):
         h, w = self.scr.getmaxyx()
-        self.scr.clear()
+        self.scr.erase()
         list_h = min(len(self.items) + 2, h - 8)
         total_h = 2 + list_h + 2
         start_y = max(1, (h - total_h) // 2)
-        title_str = f"{self.title}{(' *' if self.modified else '')}"
+        title_str = self.title_text()
         TUI.safe_addstr(self.scr, start_y, (w - len(title_str)) // 2, title_str, curses.color_pair(1) | curses.A_BOLD)
         bw = min(self.box_width, w - 4)
         bx = (w - bw) // 2
@@ -301,14 +315,11 @@ class SchemeEditor(ListEditor):
             self.scroll = self.cursor
         elif self.cursor >= self.scroll + vis:
             self.scroll = self.cursor - vis + 1
-        for i in range(vis):
-            idx = self.scroll + i
-            if idx >= len(self.items):
-                break
-            y = start_y + 3 + i
-            self._draw_item(y, bx, self.items[idx], bw, idx == self.cursor)
+        for i, item in enumerate(self.items[self.scroll:self.scroll + vis]):
+            self._draw_item(start_y + 3 + i, bx, item, bw, self.scroll + i == self.cursor)
         self._draw_footer(h, w)
-        self.scr.refresh()
+        self.scr.noutrefresh()
+        curses.doupdate()
 
     def _draw_item(self, y, x, item, width, selected):
         name = item
@@ -318,13 +329,11 @@ class SchemeEditor(ListEditor):
                 TUI.safe_addstr(self.scr, y, x + 2, '>', curses.color_pair(3) | curses.A_BOLD)
             return
         is_active = self.config.get('display-mode') == name
-        if selected:
-            TUI.safe_addstr(self.scr, y, x + 2, '>', curses.color_pair(3) | curses.A_BOLD)
         attr = curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0)
-        TUI.safe_addstr(self.scr, y, x + 4, name[:width - 25], attr)
+        spans = []
+        if selected:
+            spans.append((0, 1, curses.color_pair(3) | curses.A_BOLD))
         if is_active:
-            TUI.safe_addstr(self.scr, y, x + width - 12, '(ACTIVE)', curses.color_pair(2) | curses.A_BOLD)
-
-    def _draw_footer(self, h, w):
-        footer = 'Enter: Edit  Space: Set Active  n: New  d: Delete  Esc: Save & Exit  x: Export  l: Import'
-        TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
\ No newline at end of file
+            spans.append((width - 14, 8, curses.color_pair(2) | curses.A_BOLD))
+        row = f"{'>' if selected else ' '} {name[:width - 25]:<{width - 16}}{'(ACTIVE)' if is_active else ''}"
+        TUI.safe_addrow(self.scr, y, x + 2, row, attr, spans)
\ No newline at end of file
@@ -6,12 +6,14 @@ from ..keybinds import ConfirmBind, KeyBind
 from ...utils import register_key
 
 class SnippetsEditor(ListEditor):
+    footer = "n: New  d: Delete  Enter: Edit  Esc: Save & Exit  x: Export  l: Import"
     def __init__(self, scr):
         super().__init__(scr, "Code Snippets")
         self.filepath = SNIPPETS_FILE
         self._load_snippets()
         self.box_title = "Snippets"
         self.box_width = 80
+        self._line_editor = None
         
         register_key(self.keymap, ConfirmBind(self.action_select))
         register_key(self.keymap, KeyBind(ord('n'), self.action_new, "New Snippet"))
@@ -22,15 +24,20 @@ class SnippetsEditor(ListEditor):
             self.action_new(ctx)
         else:
             name, definition = self.snippets[self.cursor]
-            new_name = LineEditor(self.scr, initial_value=name, title="Edit Snippet Name").run()
+            new_name = self._prompt(name, "Edit Snippet Name")
             if new_name is not None:
                 self.snippets[self.cursor][0] = new_name
                 self.modified = True
-            new_def = LineEditor(self.scr, initial_value=definition, title="Edit Definition").run()
+            new_def = self._prompt(definition, "Edit Definition")
             if new_def is not None:
                 self.snippets[self.cursor][1] = new_def
                 self.modified = True
                 
+    def _prompt(self, value, title):
+        if self._line_editor is None:
+            self._line_editor = LineEditor(self.scr)
+        return self._line_editor.reset(title, value).run()
+
     def action_new(self, ctx):
         self.snippets.append(["new_snippet", "[definition]"])
         self.cursor = len(self.snippets) - 1
@@ -38,9 +45,9 @@ class SnippetsEditor(ListEditor):
         self._update_items()
         
         name, definition = self.snippets[self.cursor]
-        new_name = LineEditor(self.scr, initial_value=name, title="New Snippet Name").run()
+        new_name = self._prompt(name, "New Snippet Name")
         if new_name is not None: self.snippets[self.cursor][0] = new_name
-        new_def = LineEditor(self.scr, initial_value=definition, title="New Definition").run()
+        new_def = self._prompt(definition, "New Definition")
         if new_def is not None: self.snippets[self.cursor][1] = new_def
         
     def action_delete(self, ctx):
@@ -55,23 +62,23 @@ class SnippetsEditor(ListEditor):
         self.snippets = []
         try:
             content = SNIPPETS_FILE.read_text()
-            for line in content.split('\n'):
+            for line in content.splitlines():
                 line = line.strip()
-                if line.startswith('#let ') and '=' in line:
-                    rest = line[5:]
-                    eq_pos = rest.find('=')
-                    if eq_pos != -1:
-                        name = rest[:eq_pos].strip()
-                        if '(' in name:
-                            name = name[:name.find('(') + 1] + name[name.find('(') + 1:name.find(')') + 1]
-                        definition = rest[eq_pos + 1:].strip()
-                        self.snippets.append([name, definition])
+                if line.startswith('#let '):
+                    name, eq, definition = line[5:].partition('=')
+                    if eq:
+                        name = name.strip()
+                        open_p = name.find('(')
+                        if open_p != -1:
+                            name = name[:max(open_p, name.find(')')) + 1]
+                        self.snippets.append([name, definition.strip()])
         except: pass
         if not self.snippets: self.snippets = [["example", "[example text]"]]
         self._update_items()
 
     def _update_items(self):
-        self.items = self.snippets + [["+ Add new snippet...", ""]]
+        self.items[:] = self.snippets
+        self.items.append(["+ Add new snippet...", ""])
 
     def _load(self):
         self._load_snippets()
@@ -85,30 +92,32 @@ class SnippetsEditor(ListEditor):
     
     def save(self):
         try: self._save_snippets(); return True
-        except: return False
+        except OSError: return False
 
     def _draw_item(self, y, x, item, width, selected):
+        addstr, scr, cp = (TUI.safe_addstr, self.scr, TUI.CP)
         name, definition = item
         left_w = 22
         
-        if selected: TUI.safe_addstr(self.scr, y, x + 2, ">", curses.color_pair(3) | curses.A_BOLD)
+        if selected: addstr(scr, y, x + 2, ">", cp[3] | curses.A_BOLD)
         
         if name == "+ Add new snippet...":
-            TUI.safe_addstr(self.scr, y, x + 4, name, curses.color_pair(3 if selected else 4) | (curses.A_BOLD if selected else curses.A_DIM))
+            addstr(scr, y, x + 4, name, cp[3 if selected else 4] | (curses.A_BOLD if selected else curses.A_DIM))
         else:
-            TUI.safe_addstr(self.scr, y, x + 4, name[:left_w - 6], curses.color_pair(5 if selected else 4) | (curses.A_BOLD if selected else 0))
-            TUI.safe_addstr(self.scr, y, x + left_w + 2, definition[:width - left_w - 6], curses.color_pair(4) | (curses.A_BOLD if selected else 0))
+            addstr(scr, y, x + 4, name, cp[5 if selected else 4] | (curses.A_BOLD if selected else 0), left_w - 6)
+            addstr(scr, y, x + left_w + 2, definition, cp[4] | (curses.A_BOLD if selected else 0), width - left_w - 6)
 
     def refresh(self):
+        addstr, scr, cp = (TUI.safe_addstr, self.scr, TUI.CP)
         h, w = self.scr.getmaxyx()
-        self.scr.clear()
+        self.scr.erase()
         
         list_h = min(len(self.items) + 2, h - 8)
         total_h = 2 + list_h + 2
         start_y = max(1, (h - total_h) // 2)
         
-        title_str = f"{self.title}{' *' if self.modified else ''}"
-        TUI.safe_addstr(self.scr, start_y, (w - len(title_str)) // 2, title_str, curses.color_pair(1) | curses.A_BOLD)
+        title_str = self.title_text()
+        addstr(scr, start_y, (w - len(title_str)) // 2, title_str, cp[1] | curses.A_BOLD)
         
         bw = min(self.box_width, w - 4)
         bx = (w - bw) // 2
@@ -116,25 +125,18 @@ class SnippetsEditor(ListEditor):
         
         TUI.draw_box(self.scr, start_y + 2, bx, list_h, bw, self.box_title)
         
-        TUI.safe_addstr(self.scr, start_y + 3, bx + 4, "Name", curses.color_pair(1) | curses.A_BOLD)
-        TUI.safe_addstr(self.scr, start_y + 3, bx + left_w + 2, "Definition", curses.color_pair(1) | curses.A_BOLD)
+        addstr(scr, start_y + 3, bx + 4, "Name", cp[1] | curses.A_BOLD)
+        addstr(scr, start_y + 3, bx + left_w + 2, "Definition", cp[1] | curses.A_BOLD)
         
-        for i in range(1, list_h - 1):
-            TUI.safe_addstr(self.scr, start_y + 2 + i, bx + left_w, "│", curses.color_pair(4) | curses.A_DIM)
+        TUI.safe_vline(scr, start_y + 3, bx + left_w, list_h - 2, cp[4] | curses.A_DIM)
         
         vis = list_h - 3
         if self.cursor < self.scroll: self.scroll = self.cursor
         elif self.cursor >= self.scroll + vis: self.scroll = self.cursor - vis + 1
         
-        for i in range(vis):
-            idx = self.scroll + i
-            if idx >= len(self.items): break
-            y = start_y + 4 + i
-            self._draw_item(y, bx, self.items[idx], bw, idx == self.cursor)
+        for i, item in enumerate(self.items[self.scroll:self.scroll + vis]):
+            self._draw_item(start_y + 4 + i, bx, item, bw, self.scroll + i == self.cursor)
             
         self._draw_footer(h, w)
-        self.scr.refresh()
-
-    def _draw_footer(self, h, w):
-        footer = "n: New  d: Delete  Enter: Edit  Esc: Save & Exit  x: Export  l: Import"
-        TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
+        self.scr.noutrefresh()
+        curses.doupdate()
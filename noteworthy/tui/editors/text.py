@@ -1,9 +1,17 @@
 import curses
+import os
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from ..base import BaseEditor, TUI
 from ..keybinds import KeyBind, NavigationBind, ConfirmBind
 from ...utils import register_key, handle_key_event
 
+def read_lines(path):
+    text = path.read_bytes().decode()
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text.split('\n')
+
 class TextEditor(BaseEditor):
 
     def __init__(self, scr, filepath=None, initial_text=None, title='Text Editor'):
@@ -12,12 +20,15 @@ class TextEditor(BaseEditor):
         if initial_text is not None:
             self.lines = initial_text.split('\n')
         elif self.filepath and self.filepath.exists():
-            self.lines = self.filepath.read_text().split('\n')
+            self.lines = read_lines(self.filepath)
         else:
             self.lines = ['']
         self.cy, self.cx = (0, 0)
-        self.scroll_y = 0
         self.preferred_x = 0
+        self._prev_rows, self._pad = ([], None)
+        self._row_of, self._dirty_text = ({}, True)
+        self._scroll_pos = (0, 0)
+        self._wrap_width, self._wrap_points, self._line_spaces = (None, [], [])
         
         register_key(self.keymap, NavigationBind('UP', self.move_up))
         register_key(self.keymap, NavigationBind('DOWN', self.move_down))
@@ -46,114 +57,233 @@ class TextEditor(BaseEditor):
     def save(self):
         if self.filepath:
             try:
-                self.filepath.write_text('\n'.join(self.lines))
+                tmp = self.filepath.with_name(self.filepath.name + '.tmp')
+                with tmp.open('wb') as f:
+                    f.write(self.lines[0].encode())
+                    for line in self.lines[1:]:
+                        f.write(b'\n' + line.encode())
+                os.replace(tmp, self.filepath)
                 self.modified = False
                 return True
-            except:
+            except (OSError, ValueError):
                 return False
         return True
 
     def _load(self):
         if self.filepath and self.filepath.exists():
-            self.lines = self.filepath.read_text().split('\n')
+            self.lines = read_lines(self.filepath)
+        self.cy = min(self.cy, len(self.lines) - 1)
+        self.cx = min(self.cx, len(self.lines[self.cy]))
+        self._wrap_width, self._line_spaces = (None, [])
+        self._dirty_text = True
         self.refresh()
 
     def refresh(self):
         h, w = TUI.get_dims(self.scr)
-        self.scr.clear()
-        
-        title_str = f"{self.title}{(' *' if self.modified else '')}"
-        _, tx = TUI.center(self.scr, content_w=len(title_str))
-        TUI.safe_addstr(self.scr, 0, tx, title_str, curses.color_pair(1) | curses.A_BOLD)
+        shape = (h, w, self.modified, self.title)
+        if shape != self._last_shape:
+            self.scr.erase()
+            title_str = self.title_text()
+            _, tx = TUI.center(self.scr, content_w=len(title_str))
+            TUI.safe_addstr(self.scr, 0, tx, title_str, curses.color_pair(1) | curses.A_BOLD)
+            footer = 'Esc: Save & Exit  ^X: Export  ^L: Import'
+            _, fx = TUI.center(self.scr, content_w=len(footer))
+            TUI.safe_addstr(self.scr, h - 1, fx, footer, curses.color_pair(4) | curses.A_DIM)
+            self._pad = curses.newpad(max(1, h - 5), w + 2)
+            self._last_shape, self._prev_rows = (shape, [None] * max(0, h - 5))
         
-        visual_lines = self._get_visual_lines(w - 5)
-        vcy = 0
-        for i, (text, l_idx, start_idx) in enumerate(visual_lines):
-            if l_idx == self.cy:
-                is_last_chunk = True
-                if i + 1 < len(visual_lines) and visual_lines[i + 1][1] == l_idx:
-                    is_last_chunk = False
-                if self.cx >= start_idx and (self.cx < start_idx + len(text) or (self.cx == start_idx + len(text) and is_last_chunk)):
-                    vcy = i
-                    break
-        if vcy < self.scroll_y:
-            self.scroll_y = vcy
-        elif vcy >= self.scroll_y + (h - 5):
-            self.scroll_y = vcy - (h - 6)
-        for i in range(h - 5):
-            idx = self.scroll_y + i
-            if idx >= len(visual_lines):
-                break
-            text, l_idx, start_idx = visual_lines[idx]
-            y = i + 2
-            if start_idx == 0:
-                TUI.safe_addstr(self.scr, y, 0, f'{l_idx + 1:3d} ', curses.color_pair(4) | curses.A_DIM)
-            else:
-                TUI.safe_addstr(self.scr, y, 0, '    · ', curses.color_pair(4) | curses.A_DIM)
-            TUI.safe_addstr(self.scr, y, 6, text)
-        footer = 'Esc: Save & Exit  ^X: Export  ^L: Import'
-        _, fx = TUI.center(self.scr, content_w=len(footer))
-        TUI.safe_addstr(self.scr, h - 1, fx, footer, curses.color_pair(4) | curses.A_DIM)
+        rows, pad = (h - 5, self._pad)
+        self._set_wrap_width(w - 5)
+        cur = self._cursor_pos()
+        top = self._clamp_pos(self._scroll_pos)
+        if cur < top:
+            top = cur
+        else:
+            pos, n = (top, 0)
+            while pos is not None and pos != cur and n < rows - 1:
+                pos, n = (self._next_pos(pos), n + 1)
+            if pos != cur:
+                top = cur
+                for _ in range(rows - 1):
+                    top = self._prev_pos(top) or top
+        self._scroll_pos = top
+        cur_row, row_of = (None, {})
+        visual = self._iter_visual_lines(*top)
+        for i in range(rows):
+            seg = next(visual, None)
+            row = None
+            if seg is not None:
+                l_idx, k, start, end = seg
+                row = (self.lines[l_idx][start:end], l_idx, start)
+                row_of[l_idx, k] = i
+                if (l_idx, k) == cur:
+                    cur_row = i
+            if row == self._prev_rows[i]:
+                continue
+            self._prev_rows[i] = row
+            pad.move(i, 0)
+            pad.clrtoeol()
+            if row is None:
+                continue
+            text, l_idx, start_idx = row
+            gutter = f'{l_idx + 1:3d} ' if start_idx == 0 else '    · '
+            try:
+                pad.addstr(i, 1, gutter, curses.color_pair(4) | curses.A_DIM)
+                pad.addstr(i, 7, TUI.clip_width(text, w - 6))
+            except curses.error:
+                pass
+        self._row_of, self._dirty_text = (row_of, False)
         
+        cur_x = 7 + (self.cx - self._segments(cur[0])[0][cur[1]])
+        if cur_row is not None and cur_x < w:
+            pad.move(cur_row, cur_x)
+        self.scr.noutrefresh()
+        if rows > 0:
+            pad.noutrefresh(0, 0, 3, 0, rows + 2, w + 1)
+        curses.curs_set(0)
+        TUI.sync_update()
         curses.curs_set(1)
-        cur_y = vcy - self.scroll_y + 3
-        cur_x = 7 + (self.cx - visual_lines[vcy][2])
-        if 0 <= cur_y < h and 0 <= cur_x < w:
-            self.scr.move(cur_y, cur_x)
-        self.scr.refresh()
-
-    def _get_visual_lines(self, width):
-        visual_lines = []
-        for l_idx, line in enumerate(self.lines):
-            if not line:
-                visual_lines.append(('', l_idx, 0))
-                continue
-            i = 0
-            while i < len(line):
-                chunk = line[i:i + width]
-                if len(chunk) < width:
-                    visual_lines.append((chunk, l_idx, i))
-                    i += len(chunk)
+
+    def _redraw_cursor_only(self):
+        h, w = TUI.get_dims(self.scr)
+        if self._dirty_text or (h, w, self.modified, self.title) != self._last_shape:
+            return False
+        cur = self._cursor_pos()
+        row = self._row_of.get(cur)
+        cur_x = 7 + (self.cx - self._segments(cur[0])[0][cur[1]]) if row is not None else w
+        if cur_x >= w:
+            return False
+        self._pad.move(row, cur_x)
+        self._pad.noutrefresh(0, 0, 3, 0, h - 3, w + 1)
+        curses.doupdate()
+        return True
+
+    def _wrap_line(self, l_idx, width):
+        line, spaces = (self.lines[l_idx], self._spaces(l_idx))
+        starts, ends = ([0], [])
+        i, n = (0, len(line))
+        while i < n:
+            if n - i < width:
+                i = n
+                ends.append(i)
+            else:
+                j = bisect_left(spaces, i + width) - 1
+                if j >= 0 and spaces[j] >= i:
+                    ends.append(spaces[j])
+                    i = spaces[j] + 1
                 else:
-                    last_space = chunk.rfind(' ')
-                    if last_space != -1:
-                        visual_lines.append((chunk[:last_space], l_idx, i))
-                        i += last_space + 1
-                    else:
-                        visual_lines.append((chunk, l_idx, i))
-                        i += width
-        return visual_lines
+                    i += width
+                    ends.append(i)
+            if i < n:
+                starts.append(i)
+        if not ends:
+            ends.append(0)
+        return starts, ends
+
+    def _spaces(self, l_idx):
+        sp = self._line_spaces[l_idx]
+        if sp is None:
+            line = self.lines[l_idx]
+            sp = self._line_spaces[l_idx] = [i for i, c in enumerate(line) if c == ' '] if ' ' in line else []
+        return sp
+
+    def _set_wrap_width(self, width):
+        if len(self._line_spaces) != len(self.lines):
+            self._line_spaces, self._wrap_width = ([None] * len(self.lines), None)
+        if width != self._wrap_width:
+            self._wrap_width, self._wrap_points = (width, [None] * len(self.lines))
+
+    def _segments(self, l_idx):
+        wp = self._wrap_points[l_idx]
+        if wp is None:
+            wp = self._wrap_points[l_idx] = self._wrap_line(l_idx, self._wrap_width)
+        return wp
+
+    def _line_changed(self, l_idx):
+        self._dirty_text = True
+        if self._wrap_width is not None:
+            self._wrap_points[l_idx] = self._line_spaces[l_idx] = None
+
+    def _line_inserted(self, l_idx):
+        self._dirty_text = True
+        if self._wrap_width is not None:
+            self._wrap_points.insert(l_idx, None)
+            self._line_spaces.insert(l_idx, None)
+
+    def _line_removed(self, l_idx):
+        self._dirty_text = True
+        if self._wrap_width is not None:
+            del self._wrap_points[l_idx]
+            del self._line_spaces[l_idx]
+
+    def _iter_visual_lines(self, l_idx, k):
+        while l_idx < len(self.lines):
+            starts, ends = self._segments(l_idx)
+            for k in range(k, len(starts)):
+                yield l_idx, k, starts[k], ends[k]
+            l_idx, k = (l_idx + 1, 0)
+
+    def _cursor_pos(self):
+        return (self.cy, bisect_right(self._segments(self.cy)[0], self.cx) - 1)
+
+    def _clamp_pos(self, pos):
+        l_idx = min(pos[0], len(self.lines) - 1)
+        return (l_idx, min(pos[1], len(self._segments(l_idx)[0]) - 1))
+
+    def _prev_pos(self, pos):
+        l_idx, k = pos
+        if k > 0:
+            return (l_idx, k - 1)
+        if l_idx > 0:
+            return (l_idx - 1, len(self._segments(l_idx - 1)[0]) - 1)
+        return None
+
+    def _next_pos(self, pos):
+        l_idx, k = pos
+        if k + 1 < len(self._segments(l_idx)[0]):
+            return (l_idx, k + 1)
+        if l_idx + 1 < len(self.lines):
+            return (l_idx + 1, 0)
+        return None
 
     def run(self):
         TUI.disable_flow_control()
-        self.refresh()
-        while True:
-            if not TUI.check_terminal_size(self.scr):
-                return None
-            k = self.scr.getch()
-            
-            handled, res = handle_key_event(k, self.keymap, self)
-            if handled:
-                if res == 'EXIT_WITH_CONTENT':
-                    return '\n'.join(self.lines) if not self.filepath else None
-            elif 32 <= k <= 126:
-                self.handle_char(k)
-            
+        try:
             self.refresh()
+            while True:
+                if not TUI.check_terminal_size(self.scr):
+                    return None
+                k = self.scr.getch()
+                
+                handled, res = handle_key_event(k, self.keymap, self)
+                if handled:
+                    if res == 'EXIT_WITH_CONTENT':
+                        return '\n'.join(self.lines) if not self.filepath else None
+                elif 32 <= k <= 126:
+                    self.handle_char(k)
+                
+                if not self._redraw_cursor_only():
+                    self.refresh()
+        finally:
+            curses.curs_set(0)
 
     def handle_char(self, k):
         self.lines[self.cy] = self.lines[self.cy][:self.cx] + chr(k) + self.lines[self.cy][self.cx:]
+        self._line_changed(self.cy)
         self.cx += 1
         self.modified = True
         
     def handle_tab(self, ctx):
         self.lines[self.cy] = self.lines[self.cy][:self.cx] + '    ' + self.lines[self.cy][self.cx:]
+        self._line_changed(self.cy)
         self.cx += 4
         self.modified = True
 
     def handle_enter(self, ctx):
         self.lines.insert(self.cy + 1, self.lines[self.cy][self.cx:])
         self.lines[self.cy] = self.lines[self.cy][:self.cx]
+        self._line_changed(self.cy)
+        self._line_inserted(self.cy + 1)
         self.cy += 1
         self.cx = 0
         self.modified = True
@@ -161,12 +291,15 @@ class TextEditor(BaseEditor):
     def handle_backspace(self, ctx):
         if self.cx > 0:
             self.lines[self.cy] = self.lines[self.cy][:self.cx - 1] + self.lines[self.cy][self.cx:]
+            self._line_changed(self.cy)
             self.cx -= 1
             self.modified = True
         elif self.cy > 0:
             pl = len(self.lines[self.cy - 1])
             self.lines[self.cy - 1] += self.lines[self.cy]
             del self.lines[self.cy]
+            self._line_removed(self.cy)
+            self._line_changed(self.cy - 1)
             self.cy -= 1
             self.cx = pl
             self.modified = True
@@ -174,50 +307,40 @@ class TextEditor(BaseEditor):
     def handle_delete(self, ctx):
         if self.cx < len(self.lines[self.cy]):
             self.lines[self.cy] = self.lines[self.cy][:self.cx] + self.lines[self.cy][self.cx + 1:]
+            self._line_changed(self.cy)
             self.modified = True
         elif self.cy < len(self.lines) - 1:
             self.lines[self.cy] += self.lines[self.cy + 1]
             del self.lines[self.cy + 1]
+            self._line_removed(self.cy + 1)
+            self._line_changed(self.cy)
             self.modified = True
 
-    def _get_visual_info(self):
-        visual_lines = self._get_visual_lines(self.scr.getmaxyx()[1] - 5)
-        vcy = 0
-        for i, (text, l_idx, start_idx) in enumerate(visual_lines):
-            if l_idx == self.cy:
-                is_last_chunk = True
-                if i + 1 < len(visual_lines) and visual_lines[i + 1][1] == l_idx:
-                    is_last_chunk = False
-                if self.cx >= start_idx and (self.cx < start_idx + len(text) or (self.cx == start_idx + len(text) and is_last_chunk)):
-                    vcy = i
-                    break
-        return visual_lines, vcy
+    def _move_visual(self, step, count=1):
+        self._set_wrap_width(TUI.get_dims(self.scr)[1] - 5)
+        cur = target = self._cursor_pos()
+        for _ in range(count):
+            target = step(target) or target
+        if target != cur:
+            starts, ends = self._segments(self.cy)
+            curr_vx = self.cx - starts[cur[1]]
+            self.cy = target[0]
+            t_starts, t_ends = self._segments(self.cy)
+            self.cx = t_starts[target[1]] + min(curr_vx, t_ends[target[1]] - t_starts[target[1]])
 
     def move_up(self, ctx):
-        visual_lines, vcy = self._get_visual_info()
-        if vcy > 0:
-            target_vcy = vcy - 1
-            t_text, t_lidx, t_start = visual_lines[target_vcy]
-            curr_vx = self.cx - visual_lines[vcy][2]
-            self.cy = t_lidx
-            self.cx = t_start + min(curr_vx, len(t_text))
+        self._move_visual(self._prev_pos)
 
     def move_down(self, ctx):
-        visual_lines, vcy = self._get_visual_info()
-        if vcy < len(visual_lines) - 1:
-            target_vcy = vcy + 1
-            t_text, t_lidx, t_start = visual_lines[target_vcy]
-            curr_vx = self.cx - visual_lines[vcy][2]
-            self.cy = t_lidx
-            self.cx = t_start + min(curr_vx, len(t_text))
+        self._move_visual(self._next_pos)
             
     def move_pgup(self, ctx):
         h, _ = self.scr.getmaxyx()
-        for _ in range(h - 5): self.move_up(ctx)
+        self._move_visual(self._prev_pos, h - 5)
         
     def move_pgdn(self, ctx):
         h, _ = self.scr.getmaxyx()
-        for _ in range(h - 5): self.move_down(ctx)
+        self._move_visual(self._next_pos, h - 5)
 
     def move_left(self, ctx):
         if self.cx > 0:
@@ -1,30 +1,37 @@
 import curses
 from .base import TUI
-from ..config import LOGO
+from ..config import LOGO, LOGO_H, LOGO_W
 from ..utils import register_key, handle_key_event
 from .keybinds import KeyBind, NavigationBind, ConfirmBind
 
+KEYBINDINGS = [('General', ''), ('Arrows/hjkl', 'Navigation'), ('Enter', 'Select / Confirm'), ('Esc', 'Back / Cancel'), ('?', 'Show this help'), ('', ''), ('Editors', ''), ('Space', 'Toggle Checkbox / Bool'), ('i', 'Insert (Text)'), ('d', 'Delete (Item/Line)'), ('n', 'New Item'), ('s', 'Save (explicit)'), ('', ''), ('Builder', ''), ('Space', 'Toggle Chapter/Page'), ('a / n', 'Select All / None'), ('d / f / l', 'Toggle Options'), ('c', 'Configure Flags')]
+HELP_BW, HELP_BH = (60, 20)
+
+def _build_help_rows():
+    rows = []
+    for i, (k, v) in enumerate(KEYBINDINGS[:HELP_BH - 4]):
+        if not v:
+            rows.append((2 + i, 2, k, 5, curses.A_BOLD))
+        else:
+            rows.append((2 + i, 4, k, 4, curses.A_BOLD))
+            rows.append((2 + i, 24, v, 4, 0))
+    return tuple(rows)
+
+HELP_ROWS = _build_help_rows()
+
 def show_keybindings_menu(scr):
     h_raw, w_raw = scr.getmaxyx()
     h, w = (h_raw - 2, w_raw - 2)
-    bw, bh = (60, 20)
+    bw, bh = (HELP_BW, HELP_BH)
     bx, by = ((w - bw) // 2, (h - bh) // 2)
     win = curses.newwin(bh, bw, by, bx)
     win.box()
-    start_y = 2
     win.addstr(0, 2, ' KEYBINDINGS ', curses.color_pair(1) | curses.A_BOLD)
-    keys = [('General', ''), ('Arrows/hjkl', 'Navigation'), ('Enter', 'Select / Confirm'), ('Esc', 'Back / Cancel'), ('?', 'Show this help'), ('', ''), ('Editors', ''), ('Space', 'Toggle Checkbox / Bool'), ('i', 'Insert (Text)'), ('d', 'Delete (Item/Line)'), ('n', 'New Item'), ('s', 'Save (explicit)'), ('', ''), ('Builder', ''), ('Space', 'Toggle Chapter/Page'), ('a / n', 'Select All / None'), ('d / f / l', 'Toggle Options'), ('c', 'Configure Flags')]
-    for k, v in keys:
-        if not v:
-            win.addstr(start_y, 2, k, curses.color_pair(5) | curses.A_BOLD)
-        else:
-            win.addstr(start_y, 4, k, curses.color_pair(4) | curses.A_BOLD)
-            win.addstr(start_y, 24, v, curses.color_pair(4))
-        start_y += 1
-        if start_y >= bh - 2:
-            break
+    for y, x, text, pair, attr in HELP_ROWS:
+        win.addstr(y, x, text, curses.color_pair(pair) | attr)
     win.addstr(bh - 2, 2, 'Press any key to close...', curses.color_pair(4) | curses.A_DIM)
-    win.refresh()
+    win.noutrefresh()
+    TUI.sync_update()
     win.getch()
 
 class MainMenu:
@@ -70,13 +77,13 @@ class MainMenu:
         h_raw, w_raw = self.scr.getmaxyx()
         h, w = (h_raw - 2, w_raw - 2)
         self.scr.clear()
-        lh = len(LOGO)
+        lh = LOGO_H
         layout = 'vert'
         if h < lh + 18 and w > 80:
             layout = 'horz'
         if layout == 'vert':
             start_y = max(1, (h - lh - 10) // 2)
-            lgx = (w - 14) // 2
+            lgx = (w - LOGO_W) // 2
             for i, line in enumerate(LOGO):
                 TUI.safe_addstr(self.scr, start_y + i, lgx, line, curses.color_pair(1) | curses.A_BOLD)
             TUI.safe_addstr(self.scr, start_y + lh + 1, (w - 10) // 2, 'NOTEWORTHY', curses.color_pair(1) | curses.A_BOLD)
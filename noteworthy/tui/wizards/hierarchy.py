@@ -1,8 +1,9 @@
 import curses
-import json
+import os
 from pathlib import Path
 from ..base import TUI
 from ...config import HIERARCHY_FILE, CONFIG_FILE
+from ...utils import load_json_cached, write_json
 
 class HierarchyWizard:
 
@@ -11,42 +12,36 @@ class HierarchyWizard:
 
     def run(self):
         try:
+            try:
+                config = load_json_cached(CONFIG_FILE, mutable=False)
+                chap_name = config.get('chapter-name', 'Chapter')
+                sect_name = config.get('subchap-name', 'Section')
+            except (OSError, ValueError, AttributeError):
+                chap_name, sect_name = ('Chapter', 'Section')
             hierarchy = []
             content_dir = Path('content')
             has_content = False
             if content_dir.exists():
                 chapters = {}
-                for ch_dir in sorted(content_dir.iterdir()):
-                    if not ch_dir.is_dir() or not ch_dir.name.isdigit():
-                        continue
+                isdecimal = str.isdecimal
+                with os.scandir(content_dir) as it:
+                    ch_dirs = sorted(((int(e.name), e.name, e.path) for e in it if isdecimal(e.name) and e.is_dir()))
+                for ch_num, _, ch_path in ch_dirs:
                     try:
-                        ch_num = int(ch_dir.name)
-                        pages = []
-                        for p in sorted(ch_dir.glob('*.typ')):
-                            pages.append({'id': p.stem, 'title': 'Untitled Section'})
+                        with os.scandir(ch_path) as it:
+                            names = sorted((e.name for e in it if e.name.endswith('.typ')))
+                        pages = [{'id': name[:-4], 'title': 'Untitled Section'} for name in names]
                         if pages:
-                            try:
-                                config = json.loads(CONFIG_FILE.read_text())
-                                chap_name = config.get('chapter-name', 'Chapter')
-                            except:
-                                chap_name = 'Chapter'
                             chapters[ch_num] = {'title': f'{chap_name} {ch_num}', 'summary': '', 'pages': pages}
                             has_content = True
-                    except:
+                    except OSError:
                         pass
                 if has_content:
-                    hierarchy = [chapters[k] for k in sorted(chapters.keys())]
+                    hierarchy = list(chapters.values())
             if not has_content:
-                try:
-                    config = json.loads(CONFIG_FILE.read_text())
-                    chap_name = config.get('chapter-name', 'Chapter')
-                    sect_name = config.get('subchap-name', 'Section')
-                except:
-                    chap_name = 'Chapter'
-                    sect_name = 'Section'
                 hierarchy = [{'title': f'First {chap_name}', 'summary': 'Getting started', 'pages': [{'id': '01.01', 'title': f'First {sect_name}'}]}]
             HIERARCHY_FILE.parent.mkdir(parents=True, exist_ok=True)
-            HIERARCHY_FILE.write_text(json.dumps(hierarchy, indent=4))
+            write_json(HIERARCHY_FILE, hierarchy)
             h, w = self.scr.getmaxyx()
             self.scr.clear()
             msg = 'Hierarchy auto-generated from content' if has_content else 'Created default hierarchy structure'
@@ -54,5 +49,5 @@ class HierarchyWizard:
             self.scr.refresh()
             curses.napms(1000)
             return 'edit'
-        except:
+        except (OSError, curses.error):
             return None
\ No newline at end of file
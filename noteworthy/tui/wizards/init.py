@@ -1,24 +1,70 @@
 import curses
-import json
+from dataclasses import dataclass
 from ..base import TUI
-from ...config import CONFIG_FILE, LOGO
-from ...config import CONFIG_FILE, LOGO
-from ...utils import load_config_safe, register_key, handle_key_event
+from ...config import CONFIG_FILE, LOGO, LOGO_H
+from ...utils import load_config_safe, register_key, handle_key_event, write_json
 from ..editors.schemes import extract_themes
+from ..editors.config import opts_index
 from ..keybinds import KeyBind, NavigationBind, ConfirmBind
 
+FOOTER_HORZ = 'Enter:Next  Back:Prev  Esc:Cancel'
+FOOTER_CHOICE = '←→:Select  Enter:Confirm  Backspace:Back  Esc:Cancel'
+FOOTER_INPUT = 'Enter:Input  Backspace:Back  Esc:Cancel'
+
+@dataclass(slots=True, frozen=True)
+class Step:
+    key: str
+    label: str
+    prompt: str
+    stype: str
+    choices: tuple = None
+
+@dataclass(slots=True)
+class WizardLayout:
+    kind: str
+    logo_y: int
+    logo_x: int
+    logo_n: int
+    steps_y: int
+    steps_n: int
+    head_y: int
+    box_y: int
+    box_x: int
+    box_h: int
+    box_w: int
+    prompt_y: int
+    choice_y: int
+    choice_x: int
+    choice_w: int
+    input_y: int
+    footer_y: int
+
+def compute_wizard_layout(h, w):
+    if w > 100:
+        lh = LOGO_H
+        ly, lx = (max(0, (h - lh) // 2), max(0, (w - 16 - 60) // 2))
+        sy, dx, dw, dy = (ly + lh + 2, lx + 24, 55, max(0, (h - 16) // 2))
+        return WizardLayout('horz', ly, lx, max(0, min(lh, h - ly)), sy, max(1, h - 4 - sy), dy + 2, dy, dx, 16, dw, dy + 4, dy + 7, dx, dw, dy + 10, h - 3)
+    start_y = max(1, (h - 16) // 2)
+    bw = min(60, w - 4)
+    bx = (w - bw) // 2
+    return WizardLayout('vert', 0, 0, 0, 0, 0, start_y, start_y + 5, bx, 7, bw, start_y + 6, start_y + 8, 0, w, start_y + 10, h - 3)
+
 class InitWizard:
 
     def __init__(self, scr):
         self.scr = scr
-        themes = extract_themes()
+        themes = extract_themes() or ['rose-pine']
         self.config = {'title': '', 'subtitle': '', 'authors': [], 'affiliation': '', 'logo': None, 'show-solution': True, 'solutions-text': 'Solutions', 'problems-text': 'Problems', 'chapter-name': 'Chapter', 'subchap-name': 'Section', 'font': 'IBM Plex Serif', 'title-font': 'Noto Sans Adlam', 'display-cover': True, 'display-outline': True, 'display-chap-cover': True, 'box-margin': '5pt', 'box-inset': '15pt', 'render-sample-count': 5000, 'render-implicit-count': 100, 'display-mode': 'rose-pine', 'pad-chapter-id': True, 'pad-page-id': True, 'heading-numbering': None}
-        self.steps = [('title', 'Document Title', 'Enter the main title of your document:', 'str'), ('subtitle', 'Subtitle', 'Enter a subtitle (optional, press Enter to skip):', 'str'), ('authors', 'Authors', 'Enter author names (comma-separated):', 'list'), ('affiliation', 'Affiliation', 'Enter your organization/affiliation:', 'str'), ('display-mode', 'Color Theme', 'Use ←/→ to select, Enter to confirm:', 'choice', themes), ('font', 'Body Font', 'Enter body font name:', 'str'), ('title-font', 'Title Font', 'Enter title font name:', 'str'), ('chapter-name', 'Chapter Label', "What to call chapters (e.g., 'Chapter', 'Unit'):", 'str'), ('subchap-name', 'Section Label', "What to call sections (e.g., 'Section', 'Lesson'):", 'str')]
+        self.steps = (Step('title', 'Document Title', 'Enter the main title of your document:', 'str'), Step('subtitle', 'Subtitle', 'Enter a subtitle (optional, press Enter to skip):', 'str'), Step('authors', 'Authors', 'Enter author names (comma-separated):', 'list'), Step('affiliation', 'Affiliation', 'Enter your organization/affiliation:', 'str'), Step('display-mode', 'Color Theme', 'Use ←/→ to select, Enter to confirm:', 'choice', tuple(themes)), Step('font', 'Body Font', 'Enter body font name:', 'str'), Step('title-font', 'Title Font', 'Enter title font name:', 'str'), Step('chapter-name', 'Chapter Label', "What to call chapters (e.g., 'Chapter', 'Unit'):", 'str'), Step('subchap-name', 'Section Label', "What to call sections (e.g., 'Section', 'Lesson'):", 'str'))
         self.current_step = 0
         self.choice_index = 0
         self.input_y = 0
         self.input_x = 0
         input_w = 50
+        self._frame, self._choice_box, self._choice_strs, self._layout_cache = (None, None, {}, {})
+        n = len(self.steps)
+        self._heads = [(f'Step {i + 1}/{n}: {s.label}', f'Step {i + 1} of {n}') for i, s in enumerate(self.steps)]
         TUI.init_colors()
         
         self.keymap = {}
@@ -35,34 +81,31 @@ class InitWizard:
     def action_prev(self, ctx):
         if self.current_step > 0:
             self.current_step -= 1
-            if self.steps[self.current_step][3] == 'choice':
-                choices = self.steps[self.current_step][4]
-                curr = self.config.get(self.steps[self.current_step][0], choices[0])
-                self.choice_index = choices.index(curr) if curr in choices else 0
+            step = self.steps[self.current_step]
+            if step.stype == 'choice':
+                self.choice_index = opts_index(step.choices).get(self.config.get(step.key), 0)
 
     def action_choice_left(self, ctx):
-        step = self.steps[self.current_step]; stype = step[3]
-        if stype == 'choice':
-            choices = step[4]
-            self.choice_index = (self.choice_index - 1) % len(choices)
+        step = self.steps[self.current_step]
+        if step.stype == 'choice':
+            self.choice_index = (self.choice_index - 1) % len(step.choices)
 
     def action_choice_right(self, ctx):
-        step = self.steps[self.current_step]; stype = step[3]
-        if stype == 'choice':
-            choices = step[4]
-            self.choice_index = (self.choice_index + 1) % len(choices)
+        step = self.steps[self.current_step]
+        if step.stype == 'choice':
+            self.choice_index = (self.choice_index + 1) % len(step.choices)
             
     def action_next(self, ctx):
         step = self.steps[self.current_step]
-        key, stype = (step[0], step[3])
+        key, stype = (step.key, step.stype)
         
         if stype == 'choice':
-            choices = step[4]
-            self.config[key] = choices[self.choice_index]
+            self.config[key] = step.choices[self.choice_index]
             self.current_step += 1
             self.choice_index = 0
         else:
             value = self.get_input()
+            self._frame = None
             if value or key != 'title':
                 if stype == 'list':
                     self.config[key] = [s.strip() for s in value.split(',') if s.strip()] if value else []
@@ -71,124 +114,121 @@ class InitWizard:
                 self.current_step += 1
             elif not value and key == 'title':
                 h, w = self.scr.getmaxyx()
-                TUI.safe_addstr(self.scr, h - 2, (w - 20) // 2, 'Title is required!', curses.color_pair(6) | curses.A_BOLD)
-                self.scr.refresh()
+                try:
+                    self.scr.move(h - 2, 0)
+                    self.scr.clrtoeol()
+                except curses.error:
+                    pass
+                TUI.safe_addstr(self.scr, h - 3, (w - 20) // 2, 'Title is required!', curses.color_pair(6) | curses.A_BOLD)
+                self.scr.noutrefresh()
+                curses.doupdate()
                 curses.napms(1000)
 
     def refresh(self):
         h_raw, w_raw = self.scr.getmaxyx()
         h, w = (h_raw - 2, w_raw - 2)
-        self.scr.clear()
-        layout = 'vert'
-        if w > 100:
-            layout = 'horz'
-        if layout == 'horz':
-            lh = len(LOGO)
-            ly = max(0, (h - lh) // 2)
-            lx = max(0, (w - 16 - 60) // 2)
-            for i, line in enumerate(LOGO):
-                if ly + i < h:
-                    TUI.safe_addstr(self.scr, ly + i, lx, line, curses.color_pair(1) | curses.A_BOLD)
-            sy = ly + lh + 2
-            footer_y = h - 3
-            
-            # Use columns if list is too long for vertical space?
-            # Or scroll the list if current step is out of view
-            max_steps_visible = footer_y - 1 - sy
-            if max_steps_visible < 1: max_steps_visible = 1
-            
-            start_step = 0
-            if self.current_step >= max_steps_visible:
-                start_step = self.current_step - max_steps_visible + 1
-            
-            for i in range(min(len(self.steps) - start_step, max_steps_visible)):
+        frame = (h_raw, w_raw, self.current_step)
+        if frame == self._frame:
+            if self.steps[self.current_step].stype == 'choice':
+                self._draw_choice()
+                self.scr.noutrefresh()
+                curses.doupdate()
+            return
+        self._frame = frame
+        lo = self._layout_cache.get((h, w))
+        if lo is None:
+            lo = self._layout_cache.setdefault((h, w), compute_wizard_layout(h, w))
+        self.scr.erase()
+        step = self.steps[self.current_step]
+        key, label, prompt, stype = (step.key, step.label, step.prompt, step.stype)
+        if lo.kind == 'horz':
+            for i in range(lo.logo_n):
+                TUI.safe_addstr(self.scr, lo.logo_y + i, lo.logo_x, LOGO[i], curses.color_pair(1) | curses.A_BOLD)
+            start_step = max(0, self.current_step - lo.steps_n + 1)
+            for i in range(min(len(self.steps) - start_step, lo.steps_n)):
                 step_idx = start_step + i
-                step = self.steps[step_idx]
-                y_pos = sy + i
-                
-                marker = '>' if step_idx == self.current_step else ' '
-                style = curses.color_pair(3) | curses.A_BOLD if step_idx == self.current_step else curses.color_pair(4)
-                
-                if y_pos < footer_y:
-                    TUI.safe_addstr(self.scr, y_pos, lx + 2, f'{marker} {step[1]}', style)
-            
-            dx = lx + 20 + 4
-            dw = 55
-            dy = max(0, (h - 16) // 2)
-            TUI.draw_box(self.scr, dy, dx, 16, dw, 'Setup Wizard')
-            step = self.steps[self.current_step]
-            key, label, prompt, stype = (step[0], step[1], step[2], step[3])
-            TUI.safe_addstr(self.scr, dy + 2, dx + 2, f'Step {self.current_step + 1}/{len(self.steps)}: {label}', curses.color_pair(1) | curses.A_BOLD)
-            TUI.safe_addstr(self.scr, dy + 4, dx + 2, prompt[:dw - 4], curses.color_pair(4))
-            if stype == 'choice':
-                choices = step[4]
-                choice_text = f'◀  {choices[self.choice_index]}  ▶'
-                TUI.safe_addstr(self.scr, dy + 7, dx + (dw - len(choice_text)) // 2, choice_text, curses.color_pair(5) | curses.A_BOLD)
-                dots = ''.join(('●' if i == self.choice_index else '○' for i in range(len(choices))))
-                TUI.safe_addstr(self.scr, dy + 8, dx + (dw - len(dots)) // 2, dots, curses.color_pair(4) | curses.A_DIM)
-            else:
-                curr_val = self.config.get(key, '')
-                if isinstance(curr_val, list):
-                    curr_val = ', '.join(curr_val)
-                if curr_val:
-                    TUI.safe_addstr(self.scr, dy + 7, dx + 2, f'Default: {str(curr_val)[:dw - 12]}', curses.color_pair(4) | curses.A_DIM)
-            self.input_y, self.input_x, self.input_w = (dy + 10, dx + 2, dw - 4)
-            footer = 'Enter:Next  Back:Prev  Esc:Cancel'
-            TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
+                if lo.steps_y + i < lo.footer_y:
+                    marker, style = ('>', curses.color_pair(3) | curses.A_BOLD) if step_idx == self.current_step else (' ', curses.color_pair(4))
+                    TUI.safe_addstr(self.scr, lo.steps_y + i, lo.logo_x + 2, f'{marker} {self.steps[step_idx].label}', style)
+            TUI.draw_box(self.scr, lo.box_y, lo.box_x, lo.box_h, lo.box_w, 'Setup Wizard')
+            TUI.safe_addstr(self.scr, lo.head_y, lo.box_x + 2, self._heads[self.current_step][0], curses.color_pair(1) | curses.A_BOLD)
+            footer = FOOTER_HORZ
         else:
-            total_h = 16
-            start_y = max(1, (h - total_h) // 2)
-            TUI.safe_addstr(self.scr, start_y, (w - 22) // 2, 'NOTEWORTHY SETUP WIZARD', curses.color_pair(1) | curses.A_BOLD)
-            TUI.safe_addstr(self.scr, start_y + 1, (w - 40) // 2, "Let's set up your document configuration", curses.color_pair(4) | curses.A_DIM)
-            prog = f'Step {self.current_step + 1} of {len(self.steps)}'
-            TUI.safe_addstr(self.scr, start_y + 3, (w - len(prog)) // 2, prog, curses.color_pair(5))
-            step = self.steps[self.current_step]
-            key, label, prompt, stype = (step[0], step[1], step[2], step[3])
-            bw = min(60, w - 4)
-            bx = (w - bw) // 2
-            TUI.draw_box(self.scr, start_y + 5, bx, 7, bw, label)
-            TUI.safe_addstr(self.scr, start_y + 6, bx + 2, prompt[:bw - 4], curses.color_pair(4))
-            if stype == 'choice':
-                choices = step[4]
-                choice_text = f'◀  {choices[self.choice_index]}  ▶'
-                TUI.safe_addstr(self.scr, start_y + 8, (w - len(choice_text)) // 2, choice_text, curses.color_pair(5) | curses.A_BOLD)
-                dots = ''.join(('●' if i == self.choice_index else '○' for i in range(len(choices))))
-                TUI.safe_addstr(self.scr, start_y + 9, (w - len(dots)) // 2, dots, curses.color_pair(4) | curses.A_DIM)
-                footer = '←→:Select  Enter:Confirm  Backspace:Back  Esc:Cancel'
-            else:
-                curr_val = self.config.get(key, '')
-                if isinstance(curr_val, list):
-                    curr_val = ', '.join(curr_val)
-                if curr_val:
-                    TUI.safe_addstr(self.scr, start_y + 8, bx + 2, f'Default: {str(curr_val)[:bw - 12]}', curses.color_pair(4) | curses.A_DIM)
-                footer = 'Enter:Input  Backspace:Back  Esc:Cancel'
-            self.input_y, self.input_x, self.input_w = (start_y + 10, bx + 2, bw - 4)
-            TUI.safe_addstr(self.scr, h - 3, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
-        self.scr.refresh()
+            TUI.safe_addstr(self.scr, lo.head_y, (w - 22) // 2, 'NOTEWORTHY SETUP WIZARD', curses.color_pair(1) | curses.A_BOLD)
+            TUI.safe_addstr(self.scr, lo.head_y + 1, (w - 40) // 2, "Let's set up your document configuration", curses.color_pair(4) | curses.A_DIM)
+            prog = self._heads[self.current_step][1]
+            TUI.safe_addstr(self.scr, lo.head_y + 3, (w - len(prog)) // 2, prog, curses.color_pair(5))
+            TUI.draw_box(self.scr, lo.box_y, lo.box_x, lo.box_h, lo.box_w, label)
+            footer = FOOTER_CHOICE if stype == 'choice' else FOOTER_INPUT
+        TUI.safe_addstr(self.scr, lo.prompt_y, lo.box_x + 2, prompt[:lo.box_w - 4], curses.color_pair(4))
+        if stype == 'choice':
+            self._choice_box = (lo.choice_y, lo.box_x, lo.box_w, lo.choice_x, lo.choice_w)
+            self._draw_choice()
+        else:
+            curr_val = self.config.get(key, '')
+            if isinstance(curr_val, list):
+                curr_val = ', '.join(curr_val)
+            if curr_val:
+                TUI.safe_addstr(self.scr, lo.choice_y, lo.box_x + 2, f'Default: {str(curr_val)[:lo.box_w - 12]}', curses.color_pair(4) | curses.A_DIM)
+        self.input_y, self.input_x, self.input_w = (lo.input_y, lo.box_x + 2, lo.box_w - 4)
+        TUI.safe_addstr(self.scr, lo.footer_y, (w - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
+        self.scr.noutrefresh()
+        curses.doupdate()
+
+    def _draw_choice(self):
+        y, bx, bw, cx, cw = self._choice_box
+        strs = self._choice_strs.get(self.current_step)
+        if strs is None:
+            choices = self.steps[self.current_step].choices
+            base = '○' * len(choices)
+            strs = self._choice_strs[self.current_step] = tuple(((f'◀  {c}  ▶', base[:k] + '●' + base[k + 1:]) for k, c in enumerate(choices)))
+        choice_text, dots = strs[self.choice_index]
+        blank = ' ' * (bw - 2)
+        TUI.safe_addstr(self.scr, y, bx + 1, blank)
+        TUI.safe_addstr(self.scr, y + 1, bx + 1, blank)
+        TUI.safe_addstr(self.scr, y, cx + (cw - len(choice_text)) // 2, choice_text, curses.color_pair(5) | curses.A_BOLD)
+        TUI.safe_addstr(self.scr, y + 1, cx + (cw - len(dots)) // 2, dots, curses.color_pair(4) | curses.A_DIM)
 
     def get_input(self):
-        curses.echo()
         curses.curs_set(1)
-        y, x = (self.input_y, self.input_x)
+        y, x = (self.input_y, self.input_x + 2)
+        TUI.safe_addstr(self.scr, y, self.input_x, ' ' * self.input_w)
+        TUI.safe_addstr(self.scr, y, self.input_x, '> ', curses.color_pair(3) | curses.A_BOLD)
+        buf, limit = ([], self.input_w - 6)
         try:
-            real_y = y + 1
-            real_x = x + 1
-            TUI.safe_addstr(self.scr, y, x, ' ' * self.input_w)
-            TUI.safe_addstr(self.scr, y, x, '> ', curses.color_pair(3) | curses.A_BOLD)
-            self.scr.refresh()
-            value = self.scr.getstr(real_y, real_x + 2, self.input_w - 6).decode('utf-8').strip()
-        except:
-            value = ''
-        curses.noecho()
+            self.scr.move(y + 1, x + 1)
+            while True:
+                ch = self.scr.get_wch()
+                if ch in ('\n', '\r', curses.KEY_ENTER):
+                    break
+                if ch == '\x1b':
+                    buf = []
+                    break
+                if ch in ('\b', '\x7f', curses.KEY_BACKSPACE):
+                    if buf:
+                        buf.pop()
+                        TUI.safe_addstr(self.scr, y, x + len(buf), ' ')
+                elif isinstance(ch, str) and ch.isprintable() and len(buf) < limit:
+                    TUI.safe_addstr(self.scr, y, x + len(buf), ch)
+                    buf.append(ch)
+                self.scr.move(y + 1, x + 1 + len(buf))
+        except curses.error:
+            buf = []
         curses.curs_set(0)
-        return value
+        return ''.join(buf).strip()
 
     def run(self):
-        while True:
+        k = curses.KEY_RESIZE
+        while k not in (ord('\n'), curses.KEY_ENTER):
+            if k == 27:
+                return None
+            if k != curses.KEY_RESIZE:
+                k = self.scr.getch()
+                continue
             if not TUI.check_terminal_size(self.scr):
                 return None
             h, w = self.scr.getmaxyx()
-            self.scr.clear()
+            self.scr.erase()
             bh, bw = (8, min(60, w - 4))
             bx, by = ((w - bw) // 2, (h - bh) // 2)
             TUI.draw_box(self.scr, by, bx, bh, bw, ' Welcome ')
@@ -196,26 +236,30 @@ class InitWizard:
             TUI.safe_addstr(self.scr, by + 3, bx + 2, 'We will guide you to initializing your project.', curses.color_pair(4))
             footer = 'Press Enter to begin...'
             TUI.safe_addstr(self.scr, by + 6, bx + (bw - len(footer)) // 2, footer, curses.color_pair(4) | curses.A_DIM)
-            self.scr.refresh()
+            self.scr.noutrefresh()
+            curses.doupdate()
             k = self.scr.getch()
-            if k == 27:
-                return None
-            if k in (ord('\n'), 10, curses.KEY_ENTER):
-                break
-                
+
+        self._frame = None
+        k = curses.KEY_RESIZE
         while self.current_step < len(self.steps):
-            if not TUI.check_terminal_size(self.scr):
-                return None
-            self.refresh()
+            if k == curses.KEY_RESIZE:
+                if not TUI.check_terminal_size(self.scr):
+                    return None
+                self._frame = None
+                self.refresh()
             k = self.scr.getch()
             
             handled, res = handle_key_event(k, self.keymap, self)
-            if handled and res == 'EXIT':
-                return None
+            if handled:
+                if res == 'EXIT':
+                    return None
+                if self.current_step < len(self.steps):
+                    self.refresh()
                 
         try:
             CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            CONFIG_FILE.write_text(json.dumps(self.config, indent=4))
+            write_json(CONFIG_FILE, self.config)
             return True
-        except:
+        except OSError:
             return None
\ No newline at end of file
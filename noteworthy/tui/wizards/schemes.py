@@ -1,9 +1,9 @@
 import curses
-import json
 import shutil
 from pathlib import Path
 from ..base import TUI
 from ...config import SCHEMES_FILE, BASE_DIR
+from ...utils import write_json
 
 class SchemesWizard:
 
@@ -11,18 +11,30 @@ class SchemesWizard:
         self.scr = scr
 
     def run(self):
-        h, w = self.scr.getmaxyx()
-        self.scr.clear()
-        bw, bh = (min(60, w - 4), 8)
-        bx, by = ((w - bw) // 2, (h - bh) // 2)
-        TUI.draw_box(self.scr, by, bx, bh, bw, 'SCHEMES SETUP')
-        TUI.safe_addstr(self.scr, by + 2, bx + 2, 'Schemes configuration is missing.', curses.color_pair(4))
-        TUI.safe_addstr(self.scr, by + 3, bx + 2, 'Restore default color themes?', curses.color_pair(1) | curses.A_BOLD)
-        TUI.safe_addstr(self.scr, by + 5, bx + 2, 'Press Enter to Restore  |  Esc to Cancel', curses.color_pair(4) | curses.A_DIM)
-        self.scr.refresh()
+        default_src = BASE_DIR / 'templates/config/schemes.json'
+        if default_src != SCHEMES_FILE and default_src.exists():
+            try:
+                SCHEMES_FILE.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(default_src, SCHEMES_FILE)
+                return True
+            except OSError:
+                pass
+        shape = None
         while True:
             if not TUI.check_terminal_size(self.scr):
                 return None
+            h, w = self.scr.getmaxyx()
+            if (h, w) != shape:
+                shape = (h, w)
+                self.scr.erase()
+                bw, bh = (min(60, w - 4), 8)
+                bx, by = ((w - bw) // 2, (h - bh) // 2)
+                TUI.draw_box(self.scr, by, bx, bh, bw, 'SCHEMES SETUP')
+                TUI.safe_addstr(self.scr, by + 2, bx + 2, 'Schemes configuration is missing.', curses.color_pair(4))
+                TUI.safe_addstr(self.scr, by + 3, bx + 2, 'Restore default color themes?', curses.color_pair(1) | curses.A_BOLD)
+                TUI.safe_addstr(self.scr, by + 5, bx + 2, 'Press Enter to Restore  |  Esc to Cancel', curses.color_pair(4) | curses.A_DIM)
+                self.scr.noutrefresh()
+                curses.doupdate()
             k = self.scr.getch()
             if k == 27:
                 return None
@@ -90,12 +102,8 @@ class SchemesWizard:
         }
     }
 }
-            default_src = BASE_DIR / 'templates/config/schemes.json'
-            if default_src.exists() and default_src != SCHEMES_FILE:
-                shutil.copy(default_src, SCHEMES_FILE)
-            else:
-                SCHEMES_FILE.parent.mkdir(parents=True, exist_ok=True)
-                SCHEMES_FILE.write_text(json.dumps(minimal_schemes, indent=4))
+            SCHEMES_FILE.parent.mkdir(parents=True, exist_ok=True)
+            write_json(SCHEMES_FILE, minimal_schemes)
             return True
-        except:
+        except OSError:
             return None
\ No newline at end of file
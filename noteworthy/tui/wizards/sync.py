@@ -1,9 +1,8 @@
 import curses
-import json
 from pathlib import Path
 from ..base import TUI
 from ...config import HIERARCHY_FILE, CONFIG_FILE
-from ...utils import load_config_safe, get_formatted_name
+from ...utils import load_config_safe, get_formatted_name, read_json, write_json
 
 class SyncWizard:
 
@@ -13,8 +12,8 @@ class SyncWizard:
         self.new_files = new_files
         self.config = load_config_safe()
         try:
-            self.hierarchy = json.loads(HIERARCHY_FILE.read_text())
-        except:
+            self.hierarchy = read_json(HIERARCHY_FILE)
+        except (OSError, ValueError):
             self.hierarchy = []
 
     def refresh(self):
@@ -86,7 +85,7 @@ class SyncWizard:
                     pg_title = old_pg.get('title', 'Untitled Section')
                     pages.append({'title': pg_title})
                 new_hierarchy.append({'title': title, 'summary': summary, 'pages': pages})
-            HIERARCHY_FILE.write_text(json.dumps(new_hierarchy, indent=4))
+            write_json(HIERARCHY_FILE, new_hierarchy)
             return True
         except Exception as e:
             return False
@@ -1,49 +1,109 @@
+import copy
 import json
+import logging
 import shutil
 import sys
 import subprocess
+from functools import lru_cache
 from pathlib import Path
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from .config import CONFIG_FILE, SETTINGS_FILE, SYSTEM_CONFIG_DIR, INDEXIGNORE_FILE, HIERARCHY_FILE, BASE_DIR
 
+_config_dir_ready = False
+
+def ensure_config_dir():
+    global _config_dir_ready
+    if not _config_dir_ready:
+        SYSTEM_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _config_dir_ready = True
+
+def read_json(path):
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    return json.loads(Path(path).read_text())
+
+def write_json(path, value, indent=4):
+    if orjson is not None and indent in (None, 2):
+        Path(path).write_bytes(orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0))
+        return
+    with Path(path).open('w', buffering=65536) as f:
+        json.dump(value, f, indent=indent)
+
+@lru_cache(maxsize=8)
+def _load_json(path, mtime_ns, size):
+    return read_json(path)
+
+def load_json_cached(path, mutable=True):
+    st = path.stat()
+    value = _load_json(str(path), st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(value) if mutable else value
+
+def invalidate_json_cache():
+    _load_json.cache_clear()
+
+_config_fail = None
+
 def load_config_safe():
+    global _config_fail
+    key = None
     try:
-        if CONFIG_FILE.exists():
-            return json.loads(CONFIG_FILE.read_text())
-    except:
-        pass
-    return {}
+        st = CONFIG_FILE.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        if key == _config_fail:
+            return {}
+        return copy.deepcopy(_load_json(str(CONFIG_FILE), *key))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        _config_fail = key
+        logging.warning(f'Failed to load {CONFIG_FILE}: {e}')
+        return {}
 
 def save_config(config):
     try:
         CONFIG_FILE.write_text(json.dumps(config, indent=4))
+        invalidate_json_cache()
         return True
-    except:
+    except (OSError, TypeError, ValueError) as e:
+        logging.warning(f'Failed to save {CONFIG_FILE}: {e}')
         return False
 
 def load_settings():
     try:
-        SYSTEM_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        ensure_config_dir()
         if SETTINGS_FILE.exists():
-            return json.loads(SETTINGS_FILE.read_text())
-    except:
-        pass
+            return read_json(SETTINGS_FILE)
+    except (OSError, ValueError) as e:
+        logging.warning(f'Failed to load {SETTINGS_FILE}: {e}')
     return {}
 
 def save_settings(settings):
     try:
-        SYSTEM_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        SETTINGS_FILE.write_text(json.dumps(settings, indent=2))
-    except:
-        pass
+        ensure_config_dir()
+        write_json(SETTINGS_FILE, settings, indent=2)
+    except (OSError, TypeError, ValueError) as e:
+        logging.warning(f'Failed to save {SETTINGS_FILE}: {e}')
 
-def load_indexignore():
+@lru_cache(maxsize=1)
+def _load_indexignore(mtime_ns, size):
+    lines = INDEXIGNORE_FILE.read_text().splitlines()
+    return tuple(sorted({l.strip() for l in lines if l.strip() and (not l.startswith('#'))}))
+
+def load_indexignore_sorted():
     try:
-        if INDEXIGNORE_FILE.exists():
-            lines = INDEXIGNORE_FILE.read_text().strip().split('\n')
-            return {l.strip() for l in lines if l.strip() and (not l.startswith('#'))}
-    except:
+        st = INDEXIGNORE_FILE.stat()
+        return list(_load_indexignore(st.st_mtime_ns, st.st_size))
+    except FileNotFoundError:
         pass
-    return set()
+    except (OSError, ValueError) as e:
+        logging.warning(f'Failed to load {INDEXIGNORE_FILE}: {e}')
+    return []
+
+def load_indexignore():
+    return set(load_indexignore_sorted())
 
 def register_key(keymap, bind):
     if isinstance(bind.keys, list):
@@ -61,12 +121,13 @@ def handle_key_event(key_code, keymap, context=None):
 
 def save_indexignore(ignored_set):
     try:
-        SYSTEM_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        ensure_config_dir()
         content = '# Files to ignore during hierarchy sync\n# One file ID per line (e.g., 01.03)\n\n'
         content += '\n'.join(sorted(ignored_set))
         INDEXIGNORE_FILE.write_text(content)
-    except:
-        pass
+        _load_indexignore.cache_clear()
+    except OSError as e:
+        logging.warning(f'Failed to save {INDEXIGNORE_FILE}: {e}')
 
 def check_dependencies():
     if not shutil.which('typst'):